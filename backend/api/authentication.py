@@ -0,0 +1,23 @@
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import TokenUser
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация: пользователь читается из базы при обращении к полям."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя'
+            )
+        return TokenUser.from_db(
+            router.db_for_read(TokenUser),
+            [api_settings.USER_ID_FIELD],
+            [user_id]
+        )
@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.db.models import Count, Max
+from rest_framework import status
+from rest_framework.response import Response
+
+from teamflow.cache import get_team_versions
+from .constants import RESPONSE_CACHE_TIMEOUT
+from .utils import (
+    etag_matches,
+    get_team_role,
+    get_team_roles,
+    make_digest,
+    make_etag,
+)
+
+
+class ETagMixin:
+    """ETag по updated_at для list и retrieve; вложенные пользователи не входят."""
+
+    def get_etag(self, *parts):
+        return make_etag(
+            self.request.user.pk,
+            sorted(get_team_roles(self.request).items()),
+            self.request.get_full_path(),
+            *parts
+        )
+
+    def get_conditional_response(self, etag, build):
+        """304 при совпадении ETag, иначе результат build() с ETag."""
+        if etag_matches(self.request, etag):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': etag}
+            )
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def get_list_etag(self, queryset, *parts):
+        state = queryset.order_by().aggregate(
+            updated_at=Max('updated_at'),
+            count=Count('pk')
+        )
+        return self.get_etag(state['updated_at'], state['count'], *parts)
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(self.filter_queryset(self.get_queryset()))
+        return self.get_conditional_response(
+            etag,
+            lambda: super(ETagMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.get_conditional_response(
+            self.get_etag(instance.updated_at),
+            lambda: Response(self.get_serializer(instance).data)
+        )
+
+
+class TeamCacheMixin:
+    """Кеш ответа list по пользователю, командам и их версиям."""
+
+    def get_cache_team_ids(self):
+        """Команды, от которых зависит список, или None без кеширования."""
+        team_id = self.request.query_params.get('team')
+        if get_team_role(self.request, team_id) is None:
+            return None
+        return [int(team_id)]
+
+    def get_cached_response(self, build):
+        """Ответ из кеша или результат build(), сохраненный в кеш."""
+        team_ids = self.get_cache_team_ids()
+        if team_ids is None:
+            return build()
+        versions = get_team_versions(team_ids)
+        key = 'api:{}:{}'.format(self.basename, make_digest(
+            self.request.user.pk,
+            sorted(versions.items()),
+            self.request.get_full_path()
+        ))
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            lambda: super(TeamCacheMixin, self).list(request, *args, **kwargs)
+        )
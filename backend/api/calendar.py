@@ -0,0 +1,87 @@
+from dataclasses import replace
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+
+PRODID = '-//TeamFlow//Meetings//RU'
+LINE_LIMIT = 75
+
+
+def escape_text(value):
+    """Экранирование текстового значения по RFC 5545."""
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """Перенос строки длиннее 75 октетов."""
+    parts = []
+    current = ''
+    for char in line:
+        limit = LINE_LIMIT if not parts else LINE_LIMIT - 1
+        if len((current + char).encode()) > limit:
+            parts.append(current)
+            current = ''
+        current += char
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_datetime(value):
+    """Время в UTC в формате 20250101T100000Z."""
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def format_rrule(meeting):
+    """Правило повторения для RRULE."""
+    rule = meeting.get_rule()
+    value = str(replace(rule, until=None))
+    if rule.until is not None:
+        value += ';UNTIL=' + format_datetime(
+            datetime.combine(rule.until, meeting.time)
+        )
+    return value
+
+
+def event_lines(meeting, stamp):
+    """Строки VEVENT для встречи; stamp — время формирования ленты."""
+    start = format_datetime(meeting.get_start_datetime())
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:meeting-{meeting.id}@teamflow',
+        f'DTSTAMP:{stamp}',
+        f'DTSTART:{start}',
+        f'DTEND:{format_datetime(meeting.get_end_datetime())}',
+        'SUMMARY:' + escape_text(f'Встреча: {meeting.team.title}'),
+        'DESCRIPTION:' + escape_text(
+            f'Организатор: {meeting.author.username}\n'
+            f'Длительность: {meeting.duration} мин.'
+        ),
+        'END:VEVENT',
+    ]
+    if meeting.rrule:
+        lines.insert(-1, f'RRULE:{format_rrule(meeting)}')
+    return lines
+
+
+def stream_calendar(meetings):
+    """Генератор iCalendar: заголовок, события по одному и окончание."""
+    for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+    ):
+        yield fold_line(line)
+    stamp = format_datetime(timezone.now())
+    for meeting in meetings:
+        yield ''.join(fold_line(line) for line in event_lines(meeting, stamp))
+    yield fold_line('END:VCALENDAR')
@@ -0,0 +1,31 @@
+COMMENTS_PAGE_SIZE = 20
+TASKS_PAGE_SIZE = 20
+TASKS_BULK_LIMIT = 500
+MEMBERS_PAGE_SIZE = 50
+TEAM_BULK_LIMIT = 1000
+EVALUATIONS_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+DASHBOARD_MEETINGS_LIMIT = 5
+USER_SEARCH_MIN_LENGTH = 3
+USER_SEARCH_LIMIT = 10
+USER_SEARCH_MAX_LIMIT = 50
+USER_SEARCH_CANDIDATES = 200
+EXPORT_CHUNK_SIZE = 2000
+TASK_EXPORT_FIELDS = (
+    'id',
+    'title',
+    'description',
+    'status',
+    'priority',
+    'deadline',
+    'created_at',
+    'author_id',
+    'author__username',
+    'executor_id',
+    'executor__username',
+)
+CALENDAR_TOKEN_SALT = 'api.meetings.calendar'
+CALENDAR_DAYS_BEFORE = 30
+CALENDAR_DAYS_AFTER = 180
+CALENDAR_MAX_DAYS = 400
+RESPONSE_CACHE_TIMEOUT = 300
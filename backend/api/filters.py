@@ -1,5 +1,11 @@
 import django_filters
-from teamflow.models import Meeting
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+
+from teamflow.constants import SEARCH_CONFIG
+from teamflow.models import Meeting, Membership
 
 
 class MeetingFilter(django_filters.FilterSet):
@@ -9,3 +15,37 @@ class MeetingFilter(django_filters.FilterSet):
     class Meta:
         model = Meeting
         fields = ['team', 'date']
+
+
+class MembershipFilter(django_filters.FilterSet):
+    """Фильтр для участников команды по роли и имени."""
+    search = django_filters.CharFilter(method='filter_search')
+
+    class Meta:
+        model = Membership
+        fields = ['role', 'search']
+
+    def filter_search(self, queryset, name, value):
+        return queryset.filter(
+            Q(user__username__icontains=value)
+            | Q(user__first_name__icontains=value)
+            | Q(user__last_name__icontains=value)
+            | Q(user__email__icontains=value)
+        )
+
+
+class TaskFullTextSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск задач по параметру ?q=."""
+
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+        query = SearchQuery(
+            terms, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        return queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+        ).order_by('-rank', '-id')
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+
+User = get_user_model()
+
+
+class TokenUser(User):
+    """Пользователь из JWT: при первом обращении к полям строка читается целиком."""
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        if fields is not None:
+            fields = {*fields, *self.get_deferred_fields()}
+        try:
+            super().refresh_from_db(using, fields, **kwargs)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(
+                'Пользователь не найден', code='user_not_found'
+            )
+        if not self.is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен', code='user_inactive'
+            )
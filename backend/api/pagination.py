@@ -0,0 +1,168 @@
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .constants import (
+    COMMENTS_PAGE_SIZE,
+    EVALUATIONS_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MEMBERS_PAGE_SIZE,
+    TASKS_PAGE_SIZE,
+)
+
+
+class KeysetPagination(BasePagination):
+    """Постраничный вывод по ключу (keyset)."""
+
+    cursor_query_param = 'cursor'
+    page_size = COMMENTS_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    ordering = ('-id',)
+    invalid_cursor_message = 'Неверный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.current_page_size = self.get_page_size(request)
+        self.current_ordering = self.get_ordering(queryset)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_position_filter(position)
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        page = list(
+            queryset.order_by(
+                *self.current_ordering
+            )[:self.current_page_size + 1]
+        )
+        self.has_next = len(page) > self.current_page_size
+        self.page = page[:self.current_page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Поля сортировки с добавленным в конец id."""
+        ordering = [
+            field for field in queryset.query.order_by
+            if isinstance(field, str)
+        ] or list(self.ordering)
+        names = [field.lstrip('-') for field in ordering]
+        if 'id' not in names and 'pk' not in names:
+            prefix = '-' if ordering[-1].startswith('-') else ''
+            ordering.append(f'{prefix}id')
+        return tuple(ordering)
+
+    def get_position_filter(self, position):
+        """Условие «после позиции» для составного ключа."""
+        if len(position) != len(self.current_ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.current_ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        first = self.current_ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{lookup}': position[0]}) & condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        position = [
+            self.encode_value(getattr(last, field.lstrip('-')))
+            for field in self.current_ordering
+        ]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position)
+        )
+
+    def encode_value(self, value):
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+    def encode_cursor(self, position):
+        data = json.dumps(position, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+class CommentCursorPagination(KeysetPagination):
+    """Комментарии задачи от новых к старым."""
+
+    page_size = COMMENTS_PAGE_SIZE
+    ordering = ('-created_at', '-id')
+
+
+class TaskCursorPagination(KeysetPagination):
+    """Задачи команды, по умолчанию от новых к старым."""
+
+    page_size = TASKS_PAGE_SIZE
+    ordering = ('-created_at', '-id')
+
+
+class MemberCursorPagination(KeysetPagination):
+    """Участники команды в порядке вступления."""
+
+    page_size = MEMBERS_PAGE_SIZE
+    ordering = ('id',)
+
+
+class EvaluationCursorPagination(KeysetPagination):
+    """Оценки исполнителя от новых к старым."""
+
+    page_size = EVALUATIONS_PAGE_SIZE
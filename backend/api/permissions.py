@@ -1,7 +1,7 @@
 from rest_framework import permissions
 
 from teamflow.models import TeamRole
-from .utils import get_membership
+from .utils import get_team_role
 
 
 class IsTeamAdmin(permissions.BasePermission):
@@ -12,16 +12,12 @@ class IsTeamAdmin(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        team = obj
-        membership = get_membership(request.user, team)
+        role = get_team_role(request, obj)
         if request.method in permissions.SAFE_METHODS:
-            return membership is not None
+            return role is not None
         if request.method == "POST":
             return True
-        return (
-            request.user.is_superuser
-            or (membership and membership.role == TeamRole.ADMIN)
-        )
+        return request.user.is_superuser or role == TeamRole.ADMIN
 
 
 class IsManagerOrAdmin(permissions.BasePermission):
@@ -32,16 +28,13 @@ class IsManagerOrAdmin(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        team = getattr(obj, "team", None)
-        membership = get_membership(request.user, team)
+        role = get_team_role(request, getattr(obj, "team_id", None))
         if request.method in permissions.SAFE_METHODS:
-            return membership is not None
+            return role is not None
         if request.method == "POST":
             return (
                 request.user.is_superuser
-                or (membership and membership.role in [
-                    TeamRole.ADMIN, TeamRole.MANAGER
-                ])
+                or role in [TeamRole.ADMIN, TeamRole.MANAGER]
             )
         if request.method == "PUT":
             return obj.author == request.user or obj.executor == request.user
@@ -0,0 +1,64 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу отдает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON: по одному объекту на строку."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(self.stream(None, rows)).encode(self.charset)
+
+    def stream(self, fields, rows):
+        for row in rows:
+            yield json.dumps(
+                row, cls=DjangoJSONEncoder, ensure_ascii=False
+            ) + '\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV с заголовком из имен полей."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return ''.join(self.stream(fields, rows)).encode(self.charset)
+
+    def stream(self, fields, rows):
+        writer = csv.DictWriter(Echo(), fieldnames=fields)
+        yield writer.writeheader()
+        for row in rows:
+            yield writer.writerow(row)
+
+
+class ICalendarRenderer(BaseRenderer):
+    """text/calendar."""
+
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = '\n'.join(f'{key}: {value}' for key, value in data.items())
+        return str(data).encode(self.charset)
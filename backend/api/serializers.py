@@ -1,10 +1,16 @@
+from collections import Counter
 from datetime import datetime, timedelta
 
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from teamflow import recurrence
+from teamflow.cache import bump_team_versions
 from teamflow.constants import (
     MIN_RATING,
     MAX_RATING
@@ -12,13 +18,26 @@ from teamflow.constants import (
 from teamflow.models import (
     Comment,
     Evaluation,
+    ExecutorRatingStats,
     Meeting,
     Membership,
     StatusTask,
     Team,
     TeamRole,
+    TeamTaskStats,
     Task,
 )
+from .constants import (
+    CALENDAR_DAYS_AFTER,
+    CALENDAR_DAYS_BEFORE,
+    CALENDAR_MAX_DAYS,
+    TASKS_BULK_LIMIT,
+    TEAM_BULK_LIMIT,
+    USER_SEARCH_LIMIT,
+    USER_SEARCH_MAX_LIMIT,
+    USER_SEARCH_MIN_LENGTH,
+)
+from .utils import get_team_role, get_team_roles
 
 User = get_user_model()
 
@@ -39,6 +58,27 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class UserSearchSerializer(serializers.Serializer):
+    """Параметры поиска пользователей для автодополнения."""
+    q = serializers.CharField(
+        min_length=USER_SEARCH_MIN_LENGTH,
+        trim_whitespace=True
+    )
+    team = serializers.IntegerField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=USER_SEARCH_MAX_LIMIT,
+        default=USER_SEARCH_LIMIT
+    )
+
+    def validate_team(self, value):
+        if get_team_role(self.context['request'], value) is None:
+            raise serializers.ValidationError(
+                "Вы не состоите в этой команде"
+            )
+        return value
+
+
 class UserUpdateSerializers(serializers.ModelSerializer):
     """Сериализатор для изменения пользователя."""
 
@@ -128,6 +168,61 @@ class TeamSerializer(serializers.ModelSerializer):
         )
 
 
+class TeamSummarySerializer(serializers.ModelSerializer):
+    """Краткое представление команды без состава участников."""
+    participant_count = serializers.IntegerField(read_only=True)
+    my_role = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Team
+        fields = (
+            'id',
+            'title',
+            'participant_count',
+            'my_role',
+        )
+
+    def get_my_role(self, obj):
+        return get_team_role(self.context['request'], obj)
+
+
+class TeamShortSerializer(serializers.ModelSerializer):
+    """Команда, вложенная в задачи и встречи."""
+
+    class Meta:
+        model = Team
+        fields = (
+            'id',
+            'title',
+        )
+
+
+class TeamTaskStatsSerializer(serializers.ModelSerializer):
+    """Счетчики задач команды по статусам."""
+    overdue = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = TeamTaskStats
+        fields = (
+            'open',
+            'progress',
+            'completed',
+            'overdue',
+        )
+        read_only_fields = fields
+
+
+class UserTeamSerializer(serializers.ModelSerializer):
+    """Команда пользователя вместе с его ролью в ней."""
+    id = serializers.IntegerField(source='team_id')
+    title = serializers.CharField(source='team.title')
+
+    class Meta:
+        model = Membership
+        fields = ('id', 'title', 'role')
+        read_only_fields = fields
+
+
 class TeamCreateSerializers(serializers.ModelSerializer):
     """Сериализатор для создания с команды."""
     class Meta:
@@ -154,6 +249,33 @@ class TeamRemoveParticipantSerializer(serializers.Serializer):
     )
 
 
+class TeamParticipantSerializer(serializers.Serializer):
+    """Пользователь и его роль при массовом добавлении в команду."""
+    user_id = serializers.IntegerField()
+    role = serializers.ChoiceField(
+        choices=TeamRole.choices,
+        default=TeamRole.PARTICIPANT
+    )
+
+
+class TeamBulkAddParticipantsSerializer(serializers.Serializer):
+    """Сериализатор для массового добавления участников в команду."""
+    participants = serializers.ListField(
+        child=TeamParticipantSerializer(),
+        allow_empty=False,
+        max_length=TEAM_BULK_LIMIT
+    )
+
+
+class TeamBulkRemoveParticipantsSerializer(serializers.Serializer):
+    """Сериализатор для массового удаления участников из команды."""
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=TEAM_BULK_LIMIT
+    )
+
+
 class TaskSerializers(serializers.ModelSerializer):
     """Сериализатор для задач."""
 
@@ -170,7 +292,7 @@ class TaskSerializers(serializers.ModelSerializer):
     )
     author = UserSerializer(read_only=True)
     executor = UserSerializer(read_only=True)
-    team = TeamSerializer(read_only=True)
+    team = TeamShortSerializer(read_only=True)
     author_rating = serializers.SerializerMethodField()
     my_role = serializers.SerializerMethodField()
 
@@ -184,22 +306,22 @@ class TaskSerializers(serializers.ModelSerializer):
             'deadline',
             'executor_id',
             'status',
+            'priority',
+            'created_at',
             'executor',
             'team',
             'team_id',
             'author_rating',
             'my_role'
         )
+        read_only_fields = ('created_at',)
 
     def get_my_role(self, obj):
-        user = self.context['request'].user
-        membership = obj.team.memberships.filter(user=user).first()
-        return membership.role if membership else None
+        return get_team_role(self.context['request'], obj.team_id)
 
     def validate_team_id(self, value):
         """Проверяем, что пользователь состоит в указанной команде."""
-        user = self.context['request'].user
-        if not user.teams.filter(id=value.id).exists():
+        if get_team_role(self.context['request'], value) is None:
             raise serializers.ValidationError(
                 "Пользователь не состоит в указанной команде"
             )
@@ -222,10 +344,98 @@ class TaskSerializers(serializers.ModelSerializer):
         return data
 
     def get_author_rating(self, obj):
+        if hasattr(obj, 'author_rating'):
+            return obj.author_rating
         evaluation = obj.evaluations.filter(evaluator=obj.author).first()
         return evaluation.rating if evaluation else None
 
 
+class TaskBulkListSerializer(serializers.ListSerializer):
+    """Список задач для массового создания."""
+
+    def to_internal_value(self, data):
+        # Ошибки validate() DRF сворачивает в non_field_errors, поэтому
+        # проверка членства идет здесь, сразу после проверки полей.
+        attrs = super().to_internal_value(data)
+        request = self.context['request']
+        roles = get_team_roles(request)
+        members = set(Membership.objects.filter(
+            team_id__in={item['team_id'] for item in attrs},
+            user_id__in={item['executor_id'] for item in attrs},
+        ).values_list('team_id', 'user_id'))
+        errors = []
+        for item in attrs:
+            if item['team_id'] not in roles:
+                errors.append({
+                    'team_id': ['Пользователь не состоит в указанной команде']
+                })
+            elif item['executor_id'] == request.user.id:
+                errors.append({
+                    'executor_id': ['Нельзя назначить себя исполнителем задачи']
+                })
+            elif (item['team_id'], item['executor_id']) not in members:
+                errors.append({
+                    'executor_id': [
+                        'Исполнитель не состоит в указанной команде'
+                    ]
+                })
+            else:
+                errors.append({})
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        author = self.context['request'].user
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(
+                Task(author=author, **item) for item in validated_data
+            )
+            counts = Counter((task.team_id, task.status) for task in tasks)
+            for (team_id, task_status), count in counts.items():
+                TeamTaskStats.add_task(team_id, task_status, delta=count)
+            # bulk_create не отправляет post_save, версии меняются здесь
+            bump_team_versions(*{team_id for team_id, _ in counts})
+        return tasks
+
+
+class TaskBulkCreateSerializer(serializers.ModelSerializer):
+    """Задача в запросе массового создания."""
+
+    status = serializers.ChoiceField(
+        choices=StatusTask.choices,
+        default=StatusTask.OPEN
+    )
+    executor_id = serializers.IntegerField()
+    team_id = serializers.IntegerField()
+
+    class Meta:
+        model = Task
+        fields = (
+            'title',
+            'description',
+            'deadline',
+            'executor_id',
+            'team_id',
+            'status',
+            'priority',
+        )
+        list_serializer_class = TaskBulkListSerializer
+
+
+class TaskBulkStatusSerializer(serializers.Serializer):
+    """Смена статуса у нескольких задач."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=TASKS_BULK_LIMIT
+    )
+    status = serializers.ChoiceField(choices=StatusTask.choices)
+
+    def validate_ids(self, value):
+        return sorted(set(value))
+
+
 class TaskStatusUpdateSerializers(serializers.ModelSerializer):
     """Сериализатор для обновления статуса задачи."""
     class Meta:
@@ -254,16 +464,32 @@ class CommentTaskCreateSerializers(serializers.ModelSerializer):
 
     def validate(self, attrs):
         task_id = self.context['view'].kwargs['task_pk']
-        user = self.context['request'].user
+        team_ids = get_team_roles(self.context['request'])
         attrs['task'] = get_object_or_404(
             Task.objects.filter(
                 id=task_id,
-                team__participants=user
+                team_id__in=team_ids
             )
         )
         return attrs
 
 
+class CommentTaskListSerializers(serializers.ModelSerializer):
+    """Сериализатор для списка комментариев задачи."""
+    author = UserSerializer()
+
+    class Meta:
+        model = Comment
+        fields = (
+            'id',
+            'author',
+            'text',
+            'task_id',
+            'created_at',
+        )
+        read_only_fields = fields
+
+
 class CommentTaskReadSerializers(serializers.ModelSerializer):
     """Сериализатор для получения комментариев."""
     author = UserSerializer()
@@ -314,6 +540,55 @@ class EvaluationCreateSerializers(serializers.ModelSerializer):
         return attrs
 
 
+class TaskShortSerializer(serializers.ModelSerializer):
+    """Краткое представление задачи для списков оценок."""
+    team = TeamShortSerializer(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = (
+            'id',
+            'title',
+            'status',
+            'deadline',
+            'team',
+        )
+        read_only_fields = fields
+
+
+class EvaluationListSerializers(serializers.ModelSerializer):
+    """Сериализатор для списка оценок исполнителя."""
+    evaluator = UserSerializer(read_only=True)
+    task = TaskShortSerializer(read_only=True)
+
+    class Meta:
+        model = Evaluation
+        fields = (
+            'id',
+            'evaluator',
+            'task',
+            'rating',
+            'created_at'
+        )
+        read_only_fields = fields
+
+
+class ExecutorRatingStatsSerializer(serializers.ModelSerializer):
+    """Итоги оценок исполнителя."""
+    average_rating = serializers.FloatField(read_only=True)
+    total_evaluations = serializers.IntegerField(source='rating_count')
+    distribution = serializers.DictField(child=serializers.IntegerField())
+
+    class Meta:
+        model = ExecutorRatingStats
+        fields = (
+            'average_rating',
+            'total_evaluations',
+            'distribution',
+        )
+        read_only_fields = fields
+
+
 class EvaluationReadSerializers(serializers.ModelSerializer):
     """Сериализатор для получения оценок."""
     evaluator = UserSerializer(read_only=True)
@@ -331,17 +606,23 @@ class EvaluationReadSerializers(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class MeetingParticipantsField(serializers.ListField):
+    """Участники встречи списком id."""
+    child = serializers.IntegerField()
+
+    def to_representation(self, value):
+        return [user.pk for user in value.all()]
+
+
 class MeetingSerializers(serializers.ModelSerializer):
     """Сериализатор для работы со встречами."""
 
-    participants = serializers.PrimaryKeyRelatedField(
-        many=True,
-        queryset=User.objects.all(),
+    participants = MeetingParticipantsField(
         allow_empty=False,
         required=True
     )
     author = UserSerializer(read_only=True)
-    team = TeamSerializer(read_only=True)
+    team = TeamShortSerializer(read_only=True)
 
     class Meta:
         model = Meeting
@@ -351,63 +632,136 @@ class MeetingSerializers(serializers.ModelSerializer):
             'date',
             'time',
             'duration',
+            'rrule',
             'participants',
             'team'
         )
         read_only_fields = ['author', 'team']
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            self.fields['participants'].queryset = User.objects.filter(
-                teams__in=request.user.teams.all()
-            )
-
     def validate(self, attrs):
         user = self.context['request'].user
         date = attrs['date']
         time = attrs['time']
-        duration = attrs['duration']
-        participants = list(attrs['participants'])
-        participants.append(user)
+        duration = timedelta(minutes=attrs['duration'])
+        team = self.context.get('team') or self.instance.team
+        participant_ids = {*attrs['participants'], user.id}
+        participants = list(User.objects.filter(
+            memberships__team=team,
+            id__in=participant_ids
+        ))
+        invalid = participant_ids - {
+            participant.id for participant in participants
+        }
+        if invalid:
+            raise serializers.ValidationError({
+                'participants': sorted(invalid),
+                'detail': 'Пользователи не входят в команду'
+            })
         attrs['participants'] = participants
-        allowed_user = User.objects.filter(
-            teams__in=user.teams.all()
-        ).distinct()
-        for participant in participants:
-            if participant not in allowed_user:
-                raise serializers.ValidationError(
-                    {
-                        "detail": "Пользователь не входит в команду"
-                    }
-                )
-        start = datetime.combine(date, time)
-        end = start + timedelta(minutes=duration)
-        instance = getattr(self, 'instance', None)
-        for participant in participants:
-            overlapping_meetings = Meeting.objects.filter(
-                participants=participant,
-                date=date
+        rrule = attrs.get('rrule', getattr(self.instance, 'rrule', ''))
+        dates = [date]
+        if rrule:
+            try:
+                rule = recurrence.parse_rrule(rrule)
+                dates = recurrence.check_series(date, rule)
+            except DjangoValidationError as error:
+                raise serializers.ValidationError({'rrule': error.messages})
+            attrs['rrule'] = str(rule)
+        periods = [
+            (start, start + duration)
+            for start in (
+                timezone.make_aware(datetime.combine(day, time))
+                for day in dates
+            )
+        ]
+        conflicts = self.get_conflicts(participants, periods)
+        if conflicts:
+            raise serializers.ValidationError({
+                **conflicts[0],
+                'conflicts': conflicts,
+                'detail': 'Встреча пересекается с другой'
+            })
+        return attrs
+
+    def get_conflicts(self, participants, periods):
+        """Пересечения всех повторений встречи с встречами участников."""
+        start, end = periods[0][0], periods[-1][1]
+        rows = Meeting.participants.through.objects.filter(
+            user__in=participants,
+            meeting__in=Meeting.objects.overlapping(start, end)
+        ).select_related('user', 'meeting').order_by('user_id')
+        if self.instance:
+            rows = rows.exclude(meeting=self.instance)
+        busy = {}
+        conflicts = []
+        for row in rows:
+            meeting = row.meeting
+            if meeting.id not in busy:
+                busy[meeting.id] = list(recurrence.overlaps(
+                    periods, list(meeting.iter_periods(start, end))
+                ))
+            conflicts.extend(
+                (conflict_start, row.user_id, row.user.username, conflict_end)
+                for conflict_start, conflict_end in busy[meeting.id]
+            )
+        conflicts.sort(key=lambda conflict: conflict[:2])
+        return [
+            {
+                'participant': username,
+                'conflict_date': timezone.localdate(conflict_start),
+                'conflict_start': timezone.localtime(conflict_start).time(),
+                'conflict_end': timezone.localtime(conflict_end).time(),
+            }
+            for conflict_start, _, username, conflict_end in conflicts
+        ]
+
+
+class MeetingShortSerializer(serializers.ModelSerializer):
+    """Краткое представление встречи без участников и состава команды."""
+
+    class Meta:
+        model = Meeting
+        fields = (
+            'id',
+            'team_id',
+            'date',
+            'time',
+            'duration',
+        )
+        read_only_fields = fields
+
+
+class MeetingPeriodSerializer(serializers.Serializer):
+    """Окно дат [start, end) для повторений встреч."""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        today = timezone.localdate()
+        start = attrs.setdefault(
+            'start', today - timedelta(days=CALENDAR_DAYS_BEFORE)
+        )
+        end = attrs.setdefault(
+            'end', start + timedelta(
+                days=CALENDAR_DAYS_BEFORE + CALENDAR_DAYS_AFTER
             )
-            if instance:
-                overlapping_meetings = overlapping_meetings.exclude(
-                    id=instance.id
-                )
-
-            for meeting in overlapping_meetings:
-                other_start = meeting.get_start_datetime()
-                other_end = meeting.get_end_datetime()
-                if (start < other_end) and (end > other_start):
-                    raise serializers.ValidationError({
-                        'participant': participant.username,
-                        'conflict_start': other_start.time(),
-                        'conflict_end': other_end.time(),
-                        'detail': 'Встреча пересекается с другой'
-                    })
+        )
+        if end <= start:
+            raise serializers.ValidationError({
+                'end': 'Конец периода должен быть позже начала'
+            })
+        if (end - start).days > CALENDAR_MAX_DAYS:
+            raise serializers.ValidationError({
+                'end': f'Период не может быть длиннее {CALENDAR_MAX_DAYS} дней'
+            })
         return attrs
 
 
+class CalendarFeedSerializer(MeetingPeriodSerializer):
+    """Параметры ленты встреч: токен и окно дат [start, end)."""
+    token = serializers.CharField()
+
+
 class ChangeRoleSerializer(serializers.Serializer):
     """Сериализатор для изменения ролей команды."""
     user_id = serializers.IntegerField(required=True)
@@ -417,33 +771,32 @@ class ChangeRoleSerializer(serializers.Serializer):
     )
 
     def validate_user_id(self, value):
-        request = self.context['request']
-        team = self.context['team']
-        try:
-            user = User.objects.get(id=value)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Пользователь не найден")
-        membership = Membership.objects.filter(user=user, team=team).first()
-        if not membership:
-            raise serializers.ValidationError(
-                "Пользователь не состоит в вашей команде"
-            )
-        if value == request.user.id:
+        if value == self.context['request'].user.id:
             raise serializers.ValidationError(
                 "Вы не можете изменить свою собственную роль"
             )
-        return user
+        return value
 
     def validate(self, data):
         """
-        Проверка, что у пользователя еще не установлена эта роль.
+        Проверка, что пользователь состоит в команде и у него
+        еще не установлена эта роль.
         """
-        user = data['user_id']
         team = self.context['team']
-        membership = Membership.objects.get(user=user, team=team)
+        membership = Membership.objects.select_related('user').filter(
+            user_id=data['user_id'],
+            team=team
+        ).first()
+        if membership is None:
+            if User.objects.filter(id=data['user_id']).exists():
+                message = "Пользователь не состоит в вашей команде"
+            else:
+                message = "Пользователь не найден"
+            raise serializers.ValidationError({"user_id": message})
         new_role = data['role']
         if membership.role == new_role:
             raise serializers.ValidationError(
                 {"role": f"У пользователя уже установлена роль {new_role}"}
             )
+        data['membership'] = membership
         return data
@@ -1,8 +1,81 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils.http import parse_etags, quote_etag
+
 from teamflow.models import Membership
+from .constants import CALENDAR_TOKEN_SALT
+
+User = get_user_model()
+
+
+def get_team_roles(request):
+    """Роли текущего пользователя во всех его командах: {team_id: role}."""
+    roles = getattr(request, '_team_roles', None)
+    if roles is None:
+        roles = {}
+        if request.user.is_authenticated:
+            roles = dict(
+                Membership.objects.filter(
+                    user=request.user
+                ).values_list('team_id', 'role')
+            )
+        request._team_roles = roles
+    return roles
+
+
+def get_team_role(request, team):
+    """Возвращает роль текущего пользователя в команде (или None)."""
+    team_id = getattr(team, 'pk', team)
+    try:
+        team_id = int(team_id)
+    except (TypeError, ValueError):
+        return None
+    return get_team_roles(request).get(team_id)
+
+
+def load_user(user):
+    """Догружает все поля пользователя одним запросом."""
+    if user.get_deferred_fields():
+        user.refresh_from_db(fields=[
+            field.attname for field in user._meta.concrete_fields
+        ])
+    return user
+
+
+def make_digest(*parts):
+    """Короткий хеш значений: для ETag и ключей кеша."""
+    return hashlib.md5(
+        '|'.join(str(part) for part in parts).encode(),
+        usedforsecurity=False
+    ).hexdigest()
+
+
+def make_etag(*parts):
+    """Строит ETag (в кавычках) из значений, описывающих версию ответа."""
+    return quote_etag(make_digest(*parts))
+
+
+def etag_matches(request, etag):
+    """Проверяет, что клиент прислал в If-None-Match актуальный ETag."""
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    return '*' in etags or etag in etags
+
+
+def make_calendar_token(user):
+    """Подписанный токен для ссылки на календарь пользователя."""
+    return signing.dumps(
+        [user.pk, user.calendar_key.hex], salt=CALENDAR_TOKEN_SALT
+    )
 
 
-def get_membership(user, team):
-    """Возвращает membership пользователя в команде (или None)."""
-    if not user.is_authenticated:
+def get_calendar_user(token):
+    """Активный пользователь из токена календаря или None, если токен отозван."""
+    try:
+        user_id, key = signing.loads(token, salt=CALENDAR_TOKEN_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
         return None
-    return Membership.objects.filter(user=user, team=team).first()
+    return User.objects.filter(
+        pk=user_id, calendar_key=key, is_active=True
+    ).only('pk').first()
@@ -1,7 +1,31 @@
+import heapq
+import uuid
+from collections import Counter
+from datetime import datetime, time
+from itertools import islice
+from operator import attrgetter
+
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Q, QuerySet
-from django.http import Http404
+from django.utils import timezone
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import transaction
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import MD5, Concat, Greatest, Upper
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
@@ -10,35 +34,75 @@ from rest_framework.exceptions import (
     PermissionDenied,
     ValidationError
 )
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from api.filters import MeetingFilter
+from api.constants import (
+    DASHBOARD_MEETINGS_LIMIT,
+    EXPORT_CHUNK_SIZE,
+    TASKS_BULK_LIMIT,
+    TASK_EXPORT_FIELDS,
+    USER_SEARCH_CANDIDATES,
+)
+from api.filters import (
+    MeetingFilter,
+    MembershipFilter,
+    TaskFullTextSearchFilter,
+)
+from api.pagination import (
+    CommentCursorPagination,
+    EvaluationCursorPagination,
+    MemberCursorPagination,
+    TaskCursorPagination,
+)
+from api.cache import ETagMixin, TeamCacheMixin
+from api.calendar import stream_calendar
+from api.renderers import CSVRenderer, ICalendarRenderer, NDJSONRenderer
 from api.serializers import (
+    CalendarFeedSerializer,
     CommentTaskCreateSerializers,
+    CommentTaskListSerializers,
     CommentTaskReadSerializers,
     ChangeRoleSerializer,
     EvaluationCreateSerializers,
+    EvaluationListSerializers,
     EvaluationReadSerializers,
+    ExecutorRatingStatsSerializer,
+    MembershipSerializer,
+    MeetingPeriodSerializer,
     MeetingSerializers,
+    MeetingShortSerializer,
     PasswordChangeSerializer,
     TeamCreateSerializers,
     TeamSerializer,
+    TeamSummarySerializer,
+    TeamTaskStatsSerializer,
     TeamAddParticipantSerializer,
+    TeamBulkAddParticipantsSerializer,
+    TeamBulkRemoveParticipantsSerializer,
     TeamRemoveParticipantSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkStatusSerializer,
     TaskSerializers,
+    TaskShortSerializer,
     TaskStatusUpdateSerializers,
     UserSerializer,
     UserRegistrationSerializer,
+    UserSearchSerializer,
+    UserTeamSerializer,
     UserUpdateSerializers,
 )
+from teamflow.cache import bump_team_versions
 from teamflow.models import (
     Comment,
     Evaluation,
+    ExecutorRatingStats,
     Membership,
     Meeting,
+    StatusTask,
     Team,
     TeamRole,
+    TeamTaskStats,
     Task,
 )
 from .permissions import (
@@ -46,6 +110,15 @@ from .permissions import (
     IsTeamAdmin,
     IsManagerOrAdmin
 )
+from .utils import (
+    etag_matches,
+    get_calendar_user,
+    get_team_role,
+    get_team_roles,
+    load_user,
+    make_calendar_token,
+    make_etag,
+)
 
 
 User = get_user_model()
@@ -73,10 +146,61 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def get_me(self, request):
         """Получение текущего пользователя."""
-        user = request.user
+        user = load_user(request.user)
         serializer = UserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='search',
+        permission_classes=[IsAuthenticated]
+    )
+    def search(self, request):
+        """Автодополнение пользователей по логину, почте, имени и фамилии."""
+        params = UserSearchSerializer(
+            data=request.query_params,
+            context={'request': request}
+        )
+        params.is_valid(raise_exception=True)
+        query = params.validated_data['q']
+        users = User.objects.all()
+        if 'team' in params.validated_data:
+            users = users.filter(
+                memberships__team_id=params.validated_data['team']
+            )
+        fields = ('username', 'email', 'first_name', 'last_name')
+        exact = Q(username__iexact=query) | Q(email__iexact=query)
+        prefix = substring = similar = Q()
+        for field in fields:
+            prefix |= Q(**{f'{field}__istartswith': query})
+            substring |= Q(**{f'{field}__icontains': query})
+            similar |= Q(TrigramWordSimilar(Upper(field), Value(query.upper())))
+        similarity = Greatest(*(
+            TrigramWordSimilarity(query.upper(), Upper(field))
+            for field in fields
+        ))
+        condition = exact
+        for candidates in (
+            users.filter(prefix).order_by(),
+            users.filter(similar).annotate(
+                similarity=similarity
+            ).order_by('-similarity'),
+            users.filter(substring).order_by(),
+        ):
+            condition |= Q(
+                pk__in=candidates.values('pk')[:USER_SEARCH_CANDIDATES]
+            )
+        users = users.filter(condition).annotate(
+            exact=Case(When(exact, then=1), default=0),
+            prefix=Case(When(prefix, then=1), default=0),
+            similarity=similarity,
+        ).order_by('-exact', '-prefix', '-similarity', 'id')
+        serializer = UserSerializer(
+            users[:params.validated_data['limit']], many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['post'], url_path='set_password')
     def set_password(self, request):
         """Смена пароля."""
@@ -107,33 +231,64 @@ class UserViewSet(viewsets.ModelViewSet):
         detail=False,
         methods=['get'],
         url_path='me-evaluations',
-        permission_classes=[IsAuthenticated]
+        permission_classes=[IsAuthenticated],
+        pagination_class=EvaluationCursorPagination
     )
     def executor_evaluations(self, request):
-        """Получение всех оценок задач, где пользователь исполнитель."""
+        """Итоги и постраничный список оценок задач пользователя."""
+        stats = ExecutorRatingStats.for_executor(request.user)
         evaluations = Evaluation.objects.filter(
             task__executor=request.user
-        ).select_related('task', 'evaluator', 'task__team')
-        stats = evaluations.aggregate(
-            average_rating=Avg('rating'),
-            total_evaluations=Count('id')
-        )
-        average_rating = stats['average_rating']
-        if average_rating is not None:
-            average_rating = round(average_rating, 2)
-        else:
-            average_rating = 0.0
-        serializer = EvaluationReadSerializers(evaluations, many=True, context={'request': request})
-        return Response(
-            {
-                'average_rating': average_rating,
-                'total_evaluations': stats['total_evaluations'] or 0,
-                'evaluations': serializer.data
-            }
-        )
-
+        ).select_related('evaluator', 'task__team')
+        page = self.paginate_queryset(evaluations)
+        return Response({
+            **ExecutorRatingStatsSerializer(stats).data,
+            'next': self.paginator.get_next_link(),
+            'evaluations': EvaluationListSerializers(page, many=True).data,
+        })
 
-class TeamViewSet(viewsets.ModelViewSet):
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='me/dashboard',
+        url_name='me-dashboard',
+        permission_classes=[IsAuthenticated]
+    )
+    def dashboard(self, request):
+        """Сводка для главной страницы за фиксированное число запросов."""
+        user = load_user(request.user)
+        memberships = Membership.objects.filter(
+            user=user
+        ).select_related('team').order_by('team_id')
+        evaluations = ExecutorRatingStats.for_executor(user)
+        tasks = Task.objects.filter(executor=user).aggregate(
+            open=Count('id', filter=Q(status=StatusTask.OPEN)),
+            progress=Count('id', filter=Q(status=StatusTask.PROGRESS)),
+            overdue=Count('id', filter=Q(
+                deadline__lt=timezone.localdate()
+            ) & ~Q(status=StatusTask.COMPLETED)),
+        )
+        now = timezone.now()
+        meetings = Meeting.objects.for_user(user).filter(series_end_at__gt=now)
+        meetings = list(islice(heapq.merge(
+            meetings.filter(rrule='').order_by(
+                'start_at'
+            )[:DASHBOARD_MEETINGS_LIMIT].occurrences(now),
+            meetings.exclude(rrule='').occurrences(now),
+            key=attrgetter('start_at', 'id')
+        ), DASHBOARD_MEETINGS_LIMIT))
+        return Response({
+            'profile': UserSerializer(user).data,
+            'teams': UserTeamSerializer(memberships, many=True).data,
+            'evaluations': ExecutorRatingStatsSerializer(evaluations).data,
+            'tasks': tasks,
+            'upcoming_meetings': MeetingShortSerializer(
+                meetings, many=True
+            ).data,
+        })
+
+
+class TeamViewSet(TeamCacheMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с командами."""
 
     queryset = Team.objects.all()
@@ -142,8 +297,20 @@ class TeamViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Получение команд, в которых пользовать состоит."""
-        user = self.request.user
-        return Team.objects.filter(participants=user)
+        queryset = Team.objects.filter(id__in=get_team_roles(self.request))
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        if self.expand_participants():
+            return queryset.for_api()
+        return queryset.annotate(participant_count=Count('memberships'))
+
+    def get_cache_team_ids(self):
+        """Список команд зависит от всех команд пользователя."""
+        return list(get_team_roles(self.request))
+
+    def expand_participants(self):
+        """Полный состав команды отдается только по ?expand=participants."""
+        return self.request.query_params.get('expand') == 'participants'
 
     def retrieve(self, request, *args, **kwargs):
         """Получение конкретной команды с проверкой доступа."""
@@ -158,7 +325,9 @@ class TeamViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == 'create':
             return TeamCreateSerializers
-        return TeamSerializer
+        if self.expand_participants():
+            return TeamSerializer
+        return TeamSummarySerializer
 
     def perform_create(self, serializer):
         team = serializer.save()
@@ -167,6 +336,7 @@ class TeamViewSet(viewsets.ModelViewSet):
             team=team,
             role=TeamRole.ADMIN
         )
+        TeamTaskStats.objects.create(team=team)
 
     def destroy(self, request, *args, **kwargs):
         return Response(
@@ -187,9 +357,9 @@ class TeamViewSet(viewsets.ModelViewSet):
             context={'team': team, 'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        user = serializer.validated_data['user_id']
+        membership = serializer.validated_data['membership']
+        user = membership.user
         new_role = serializer.validated_data['role']
-        membership = Membership.objects.get(user=user, team=team)
         membership.role = new_role
         membership.save()
         return Response(
@@ -201,6 +371,60 @@ class TeamViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='members',
+        pagination_class=MemberCursorPagination
+    )
+    def members(self, request, pk=None):
+        """Постраничный список участников команды с фильтрами."""
+        team = self.get_object()
+        filterset = MembershipFilter(
+            request.query_params,
+            queryset=Membership.objects.filter(
+                team=team
+            ).select_related('user')
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        page = self.paginate_queryset(filterset.qs)
+        serializer = MembershipSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='tasks/export',
+        renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export_tasks(self, request, pk=None):
+        """Потоковая выгрузка задач команды (?format=ndjson|csv)."""
+        team = self.get_object()
+        rows = Task.objects.filter(team=team).order_by('id').values(
+            *TASK_EXPORT_FIELDS
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(TASK_EXPORT_FIELDS, rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="team-{team.id}-tasks.{renderer.format}"'
+        )
+        return response
+
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, pk=None):
+        """Счетчики задач команды по статусам."""
+        team = self.get_object()
+        stats = TeamTaskStats.for_team(team)
+        stats.overdue = Task.objects.filter(
+            team=team,
+            deadline__lt=timezone.localdate()
+        ).exclude(status=StatusTask.COMPLETED).count()
+        return Response(TeamTaskStatsSerializer(stats).data)
+
     @action(detail=True, methods=['put'], url_path='add-participant')
     def add_participant(self, request, pk=None):
         """Эндпоинт для добавления участника в команду."""
@@ -241,6 +465,58 @@ class TeamViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @action(detail=True, methods=['put'], url_path='add-participants')
+    def add_participants(self, request, pk=None):
+        """Массовое добавление участников в команду."""
+        team = self.get_object()
+        serializer = TeamBulkAddParticipantsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        roles = {}
+        for item in serializer.validated_data['participants']:
+            roles.setdefault(item['user_id'], item['role'])
+        existing = set(User.objects.filter(
+            id__in=roles
+        ).values_list('id', flat=True))
+        members = set(Membership.objects.filter(
+            team=team,
+            user_id__in=existing
+        ).values_list('user_id', flat=True))
+        added = sorted(existing - members)
+        Membership.objects.bulk_create(
+            [
+                Membership(team=team, user_id=user_id, role=roles[user_id])
+                for user_id in added
+            ],
+            ignore_conflicts=True
+        )
+        bump_team_versions(team.id)
+        return Response(
+            {
+                'added': added,
+                'skipped': sorted(members),
+                'rejected': sorted(set(roles) - existing),
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['delete'], url_path='remove-participants')
+    def remove_participants(self, request, pk=None):
+        """Массовое удаление участников; не состоящие в команде в skipped."""
+        team = self.get_object()
+        serializer = TeamBulkRemoveParticipantsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids = set(serializer.validated_data['user_ids'])
+        memberships = Membership.objects.filter(team=team, user_id__in=user_ids)
+        removed = set(memberships.values_list('user_id', flat=True))
+        memberships.delete()
+        return Response(
+            {
+                'removed': sorted(removed),
+                'skipped': sorted(user_ids - removed),
+            },
+            status=status.HTTP_200_OK
+        )
+
     @action(
         detail=True,
         methods=['get'],
@@ -249,13 +525,43 @@ class TeamViewSet(viewsets.ModelViewSet):
     )
     def my_role_in_team(self, request, pk=None):
         """Эндпоинт для получение роли текущего пользователя."""
-        membership = request.user.memberships.filter(team_id=pk).first()
-        if membership:
-            return Response({'role': membership.role})
-        return Response({'role': None})
+        return Response({'role': get_team_role(request, pk)})
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='my-roles',
+        url_name='my-roles',
+        permission_classes=[IsAuthenticated]
+    )
+    def my_roles(self, request):
+        """Роли текущего пользователя во всех командах или в ?ids=1,2,3."""
+        roles = get_team_roles(request)
+        etag = make_etag(*sorted(roles.items()))
+        if etag_matches(request, etag):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': etag}
+            )
+        ids = request.query_params.get('ids')
+        if ids:
+            try:
+                ids = {int(team_id) for team_id in ids.split(',')}
+            except ValueError:
+                raise ValidationError(
+                    {'ids': 'Передайте id команд через запятую'}
+                )
+            roles = {
+                team_id: role for team_id, role in roles.items()
+                if team_id in ids
+            }
+        return Response(
+            {'roles': roles},
+            headers={'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        )
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ETagMixin, TeamCacheMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с задачами."""
 
     queryset = Task.objects.all()
@@ -264,12 +570,13 @@ class TaskViewSet(viewsets.ModelViewSet):
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
+        TaskFullTextSearchFilter,
         filters.OrderingFilter
     ]
     filterset_fields = ['status', 'executor', 'author', 'team']
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'deadline', 'priority']
-    pagination_class = None
+    pagination_class = TaskCursorPagination
 
     def get_serializer_class(self):
         if self.action in ['update', 'partial_update']:
@@ -282,14 +589,100 @@ class TaskViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def perform_update(self, serializer):
+        """При смене исполнителя переносим оценки задачи в его итоги."""
+        executor_id = serializer.instance.executor_id
+        with transaction.atomic():
+            task = serializer.save()
+            if task.executor_id == executor_id:
+                return
+            for rating in task.evaluations.values_list('rating', flat=True):
+                ExecutorRatingStats.add_rating(executor_id, rating, delta=-1)
+                ExecutorRatingStats.add_rating(task.executor_id, rating)
+
     def get_queryset(self):
         """Получение задач, только своей команды."""
-        user = self.request.user
         team_id = self.request.query_params.get('team')
-        queryset = Task.objects.filter(team__participants=user)
+        queryset = Task.objects.filter(
+            team_id__in=get_team_roles(self.request)
+        )
         if team_id:
             queryset = queryset.filter(team_id=team_id)
-        return queryset.select_related('executor', 'team')
+        author_rating = Evaluation.objects.filter(
+            task_id=OuterRef('pk'),
+            evaluator_id=OuterRef('author_id')
+        ).values('rating')[:1]
+        return queryset.for_api().annotate(
+            author_rating=Subquery(author_rating)
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Массовое создание задач одним INSERT."""
+        serializer = TaskBulkCreateSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=TASKS_BULK_LIMIT,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        tasks = serializer.save()
+        created = Task.objects.filter(
+            id__in=[task.id for task in tasks]
+        ).select_related('team').order_by('id')
+        return Response(
+            TaskShortSerializer(created, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=['put'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Смена статуса у списка задач одним UPDATE."""
+        serializer = TaskBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        new_status = serializer.validated_data['status']
+        user = request.user
+        with transaction.atomic():
+            tasks = list(Task.objects.select_for_update().filter(
+                id__in=ids,
+                team_id__in=get_team_roles(request)
+            ).values_list('id', 'team_id', 'status', 'author_id', 'executor_id'))
+            found = {task[0] for task in tasks}
+            not_found = [task_id for task_id in ids if task_id not in found]
+            if not_found:
+                raise NotFound({
+                    'detail': 'Задачи не найдены',
+                    'ids': not_found
+                })
+            forbidden = [
+                task_id for task_id, _, _, author_id, executor_id in tasks
+                if user.pk not in (author_id, executor_id)
+            ]
+            if forbidden:
+                raise PermissionDenied({
+                    'detail': 'Статус может изменить только автор '
+                              'или исполнитель задачи',
+                    'ids': forbidden
+                })
+            changed = Counter(
+                (team_id, task_status)
+                for _, team_id, task_status, _, _ in tasks
+                if task_status != new_status
+            )
+            updated = Task.objects.filter(id__in=ids).exclude(
+                status=new_status
+            ).update(status=new_status, updated_at=timezone.now())
+            for (team_id, task_status), count in changed.items():
+                TeamTaskStats.add_task(team_id, task_status, delta=-count)
+                TeamTaskStats.add_task(team_id, new_status, delta=count)
+            # update() не отправляет post_save, версии меняются здесь
+            bump_team_versions(*{team_id for team_id, _ in changed})
+        return Response(
+            {'status': new_status, 'updated': updated},
+            status=status.HTTP_200_OK
+        )
 
     @action(detail=True, methods=['put'])
     def update_status(self, request, pk=None):
@@ -297,7 +690,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         task = self.get_object()
         serializer = self.get_serializer(task, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_update(serializer)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(
@@ -317,42 +710,67 @@ class TaskViewSet(viewsets.ModelViewSet):
             }
         )
         serializer.is_valid(raise_exception=True)
-        evaluation = Evaluation.objects.create(
-            task=task,
-            evaluator=request.user,
-            rating=serializer.validated_data['rating']
-        )
+        with transaction.atomic():
+            evaluation = Evaluation.objects.create(
+                task=task,
+                evaluator=request.user,
+                rating=serializer.validated_data['rating']
+            )
         return Response(
             EvaluationReadSerializers(evaluation, context={"request": request}).data,
             status=status.HTTP_201_CREATED
         )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ETagMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с комментариями."""
     permission_classes = [IsAuthenticated]
     http_method_names = ['get', 'post']
-    pagination_class = None
+    pagination_class = CommentCursorPagination
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return CommentTaskCreateSerializers
+        if self.action == 'list':
+            return CommentTaskListSerializers
         return CommentTaskReadSerializers
 
-    def get_queryset(self) -> QuerySet[Comment]:
-        task = get_object_or_404(
-            Task.objects.filter(
-                id=self.kwargs['task_pk'],
-                team__participants=self.request.user
+    def get_task(self):
+        """Задача из URL; загружается один раз на запрос."""
+        if not hasattr(self, '_task'):
+            self._task = get_object_or_404(
+                Task.objects.filter(
+                    id=self.kwargs['task_pk'],
+                    team_id__in=get_team_roles(self.request)
+                )
             )
+        return self._task
+
+    def get_queryset(self) -> QuerySet[Comment]:
+        task = self.get_task()
+        if self.action == 'list':
+            comments = task.comments.select_related('author')
+        else:
+            comments = task.comments.for_api()
+        return comments.order_by('-created_at')
+
+    def retrieve(self, request, *args, **kwargs):
+        """В ETag входят и вложенная задача, и название ее команды."""
+        comment = self.get_object()
+        return self.get_conditional_response(
+            self.get_etag(
+                comment.updated_at,
+                comment.task.updated_at,
+                comment.task.team.updated_at
+            ),
+            lambda: Response(self.get_serializer(comment).data)
         )
-        return task.comments.select_related('author').order_by('-created_at')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
 
-class MeetingViewSet(viewsets.ModelViewSet):
+class MeetingViewSet(ETagMixin, TeamCacheMixin, viewsets.ModelViewSet):
     serializer_class = MeetingSerializers
     permission_classes = [IsManagerOrAdmin]
     pagination_class = None
@@ -370,9 +788,7 @@ class MeetingViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 Q(author__teams=team_id) | Q(participants__teams=team_id)
             ).distinct()
-        return queryset.select_related(
-            "author"
-        ).prefetch_related("participants")
+        return queryset.for_api()
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -386,14 +802,113 @@ class MeetingViewSet(viewsets.ModelViewSet):
                 team = Team.objects.get(id=team_id)
             except Team.DoesNotExist:
                 raise NotFound("Команда не найдена")
-            if not team.participants.filter(id=self.request.user.id).exists():
+            if get_team_role(self.request, team) is None:
                 raise PermissionDenied("Вы не состоите в этой команде")
             context["team"] = team
         return context
 
+    def list(self, request, *args, **kwargs):
+        """Список встреч; с ?start= и ?end= отдельные повторения в окне."""
+        if not {'start', 'end'} & set(request.query_params):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_conditional_response(
+            self.get_list_etag(queryset, timezone.localdate()),
+            lambda: self.get_cached_response(
+                lambda: self.list_occurrences(request)
+            )
+        )
+
+    def list_occurrences(self, request):
+        """Повторения встреч в окне [start, end) из параметров запроса."""
+        params = MeetingPeriodSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start = timezone.make_aware(
+            datetime.combine(params.validated_data['start'], time.min)
+        )
+        end = timezone.make_aware(
+            datetime.combine(params.validated_data['end'], time.min)
+        )
+        meetings = self.filter_queryset(self.get_queryset()).in_period(
+            start, end
+        )
+        serializer = self.get_serializer(
+            meetings.occurrences(start, end),
+            many=True
+        )
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=['get', 'post'],
+        url_path='calendar-link',
+        permission_classes=[IsAuthenticated]
+    )
+    def calendar_link(self, request):
+        """Ссылка на ленту встреч; POST выпускает новую и отзывает прежнюю."""
+        if request.method == 'POST':
+            request.user.calendar_key = uuid.uuid4()
+            request.user.save(update_fields=['calendar_key'])
+        url = request.build_absolute_uri(reverse('meetings-calendar'))
+        return Response(
+            {'url': f'{url}?token={make_calendar_token(request.user)}'},
+            status=status.HTTP_200_OK
+        )
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='calendar',
+        authentication_classes=[],
+        permission_classes=[AllowAny],
+        renderer_classes=[ICalendarRenderer]
+    )
+    def calendar(self, request):
+        """Лента встреч пользователя в формате iCalendar."""
+        params = CalendarFeedSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        user = get_calendar_user(params.validated_data['token'])
+        if user is None:
+            raise PermissionDenied("Неверная ссылка на календарь")
+        start = timezone.make_aware(
+            datetime.combine(params.validated_data['start'], time.min)
+        )
+        end = timezone.make_aware(
+            datetime.combine(params.validated_data['end'], time.min)
+        )
+        meetings = Meeting.objects.for_user(user).in_period(start, end)
+        version = meetings.aggregate(digest=MD5(StringAgg(
+            Concat(
+                'id', Value(' '), 'date', Value(' '), 'time', Value(' '),
+                'duration', Value(' '), 'rrule', Value(' '),
+                'team__title', Value(' '),
+                'author__username',
+                output_field=CharField()
+            ),
+            delimiter=',',
+            ordering='id'
+        )))['digest']
+        etag = make_etag(user.pk, start, end, version)
+        if etag_matches(request, etag):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': etag}
+            )
+        events = meetings.select_related('team', 'author').order_by(
+            'start_at', 'id'
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(
+            stream_calendar(events),
+            content_type='text/calendar; charset=utf-8'
+        )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        response['Content-Disposition'] = 'inline; filename="meetings.ics"'
+        return response
+
     def perform_create(self, serializer):
         """При создании автоматически подставляем организатора и команду."""
         serializer.save(
             author=self.request.user,
-            team=self.get_serializer_context()["team"]
+            team=serializer.context["team"]
         )
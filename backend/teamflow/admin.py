@@ -66,6 +66,7 @@ class MeetingAdmin(admin.ModelAdmin):
         'date',
         'time',
         'duration',
+        'rrule',
     )
 
 
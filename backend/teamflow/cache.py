@@ -0,0 +1,45 @@
+"""Версии данных команд для кеша ответов API."""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+TEAM_VERSION_KEY = 'teamflow:team-version:{}'
+
+
+def _new_version():
+    """Начальная версия команды."""
+    return time.time_ns()
+
+
+def get_team_versions(team_ids):
+    """Версии команд {team_id: version} за одно обращение к кешу."""
+    keys = {team_id: TEAM_VERSION_KEY.format(team_id) for team_id in team_ids}
+    cached = cache.get_many(keys.values())
+    versions = {}
+    for team_id, key in keys.items():
+        if key not in cached:
+            cache.add(key, _new_version(), timeout=None)
+            cached[key] = cache.get(key)
+        versions[team_id] = cached[key]
+    return versions
+
+
+def _bump(team_ids):
+    for team_id in team_ids:
+        key = TEAM_VERSION_KEY.format(team_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _new_version(), timeout=None)
+
+
+def bump_team_versions(*team_ids):
+    """Увеличивает версии команд."""
+    team_ids = {team_id for team_id in team_ids if team_id is not None}
+    if not team_ids:
+        return
+    _bump(team_ids)
+    # Ответ, собранный другим воркером до коммита, не должен остаться
+    # в кеше под новой версией.
+    transaction.on_commit(lambda: _bump(team_ids))
@@ -4,3 +4,6 @@ MIN_RATING = 1
 MAX_RATING = 5
 MIN_DURATION = 5
 MAX_DURATION = 1440
+SEARCH_CONFIG = 'russian'
+MAX_LENGTH_RRULE = 256
+MAX_OCCURRENCES = 366
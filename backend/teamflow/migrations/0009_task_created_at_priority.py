@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-17 06:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0008_comment_task_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, help_text='Время создания задачи', verbose_name='Создана'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий')], default=2, help_text='Укажите приоритет задачи', verbose_name='Приоритет задачи'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'created_at', 'id'], name='task_team_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'deadline', 'id'], name='task_team_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'priority', 'id'], name='task_team_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'status', 'created_at', 'id'], name='task_team_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['executor', 'created_at', 'id'], name='task_executor_created_idx'),
+        ),
+    ]
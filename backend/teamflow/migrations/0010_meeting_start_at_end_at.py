@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_meeting_period(apps, schema_editor):
+    Meeting = apps.get_model('teamflow', 'Meeting')
+    meetings = Meeting.objects.only('id', 'date', 'time', 'duration')
+    for meeting in meetings.iterator():
+        meeting.start_at = timezone.make_aware(
+            datetime.combine(meeting.date, meeting.time)
+        )
+        meeting.end_at = meeting.start_at + timedelta(
+            minutes=meeting.duration
+        )
+        meeting.save(update_fields=['start_at', 'end_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0009_task_created_at_priority'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='start_at',
+            field=models.DateTimeField(editable=False, help_text='Вычисляется из даты и времени встречи', null=True, verbose_name='Начало'),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='end_at',
+            field=models.DateTimeField(editable=False, help_text='Вычисляется из начала и длительности встречи', null=True, verbose_name='Окончание'),
+        ),
+        migrations.RunPython(fill_meeting_period, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='meeting',
+            name='start_at',
+            field=models.DateTimeField(editable=False, help_text='Вычисляется из даты и времени встречи', verbose_name='Начало'),
+        ),
+        migrations.AlterField(
+            model_name='meeting',
+            name='end_at',
+            field=models.DateTimeField(editable=False, help_text='Вычисляется из начала и длительности встречи', verbose_name='Окончание'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['start_at', 'end_at'], name='meeting_period_idx'),
+        ),
+    ]
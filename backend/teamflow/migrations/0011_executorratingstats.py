@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-17 07:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_rating_stats(apps, schema_editor):
+    Evaluation = apps.get_model('teamflow', 'Evaluation')
+    ExecutorRatingStats = apps.get_model('teamflow', 'ExecutorRatingStats')
+    rows = Evaluation.objects.values('task__executor_id').annotate(
+        rating_sum=models.Sum('rating'),
+        rating_count=models.Count('id'),
+        **{
+            f'rating_{rating}': models.Count(
+                'id', filter=models.Q(rating=rating)
+            )
+            for rating in range(1, 6)
+        }
+    ).order_by()
+    ExecutorRatingStats.objects.bulk_create(
+        ExecutorRatingStats(executor_id=row.pop('task__executor_id'), **row)
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('teamflow', '0010_meeting_start_at_end_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutorRatingStats',
+            fields=[
+                ('executor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Исполнитель')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('rating_1', models.PositiveIntegerField(default=0, verbose_name='Оценок 1')),
+                ('rating_2', models.PositiveIntegerField(default=0, verbose_name='Оценок 2')),
+                ('rating_3', models.PositiveIntegerField(default=0, verbose_name='Оценок 3')),
+                ('rating_4', models.PositiveIntegerField(default=0, verbose_name='Оценок 4')),
+                ('rating_5', models.PositiveIntegerField(default=0, verbose_name='Оценок 5')),
+            ],
+            options={
+                'verbose_name': 'Статистика оценок',
+                'verbose_name_plural': 'Статистика оценок',
+            },
+        ),
+        migrations.RunPython(fill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-17 07:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_team_task_stats(apps, schema_editor):
+    Task = apps.get_model('teamflow', 'Task')
+    TeamTaskStats = apps.get_model('teamflow', 'TeamTaskStats')
+    rows = Task.objects.values('team_id').annotate(
+        **{
+            status: models.Count('id', filter=models.Q(status=status))
+            for status in ('open', 'progress', 'completed')
+        }
+    ).order_by()
+    TeamTaskStats.objects.bulk_create(
+        TeamTaskStats(**row) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0011_executorratingstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamTaskStats',
+            fields=[
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to='teamflow.team', verbose_name='Команда')),
+                ('open', models.PositiveIntegerField(default=0, verbose_name='Открыто')),
+                ('progress', models.PositiveIntegerField(default=0, verbose_name='В работе')),
+                ('completed', models.PositiveIntegerField(default=0, verbose_name='Выполнено')),
+            ],
+            options={
+                'verbose_name': 'Счетчики задач',
+                'verbose_name_plural': 'Счетчики задач',
+            },
+        ),
+        migrations.RunPython(
+            fill_team_task_stats, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.23 on 2026-10-17 07:27
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+TASK_SEARCH_VECTOR_SQL = """
+CREATE FUNCTION teamflow_task_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A')
+        || setweight(
+            to_tsvector('russian', coalesce(NEW.description, '')), 'B'
+        );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER teamflow_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON teamflow_task
+    FOR EACH ROW EXECUTE FUNCTION teamflow_task_search_vector_update();
+
+UPDATE teamflow_task SET title = title;
+"""
+
+DROP_TASK_SEARCH_VECTOR_SQL = """
+DROP TRIGGER IF EXISTS teamflow_task_search_vector_trigger ON teamflow_task;
+DROP FUNCTION IF EXISTS teamflow_task_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0012_teamtaskstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Заполняется триггером из названия и описания', null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ),
+        migrations.RunSQL(
+            TASK_SEARCH_VECTOR_SQL, DROP_TASK_SEARCH_VECTOR_SQL
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-17 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0013_task_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['team', 'date', 'time'], name='meeting_team_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['executor', 'status'], name='task_executor_status_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+import teamflow.recurrence
+
+
+def fill_series_end(apps, schema_editor):
+    Meeting = apps.get_model('teamflow', 'Meeting')
+    Meeting.objects.update(series_end_at=models.F('end_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0014_task_executor_status_meeting_team_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='rrule',
+            field=models.CharField(blank=True, default='', help_text='Подмножество RRULE: FREQ=DAILY|WEEKLY, INTERVAL, BYDAY, COUNT или UNTIL. Пусто для разовой встречи', max_length=256, validators=[teamflow.recurrence.validate_rrule], verbose_name='Правило повторения'),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='series_end_at',
+            field=models.DateTimeField(editable=False, help_text='Окончание последнего повторения встречи', null=True, verbose_name='Окончание серии'),
+        ),
+        migrations.RunPython(fill_series_end, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='meeting',
+            name='series_end_at',
+            field=models.DateTimeField(editable=False, help_text='Окончание последнего повторения встречи', verbose_name='Окончание серии'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['start_at', 'series_end_at'], name='meeting_series_period_idx'),
+        ),
+    ]
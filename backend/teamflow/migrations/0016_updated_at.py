@@ -0,0 +1,38 @@
+# Generated by Django 4.2.23 on 2026-10-17 08:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teamflow', '0015_meeting_rrule_series_end_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Время последнего изменения комментария', verbose_name='Изменен'),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Время последнего изменения встречи', verbose_name='Изменена'),
+        ),
+        migrations.AddField(
+            model_name='membership',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Время последнего изменения роли', verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Время последнего изменения задачи', verbose_name='Изменена'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Время последнего изменения команды', verbose_name='Изменена'),
+        ),
+    ]
@@ -1,10 +1,17 @@
+import copy
+import heapq
 from datetime import datetime, timedelta
+from operator import attrgetter
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 import teamflow.constants as constants
+from teamflow import recurrence
 
 
 User = get_user_model()
@@ -24,6 +31,87 @@ class StatusTask(models.TextChoices):
     COMPLETED = 'completed', 'Выполнена'
 
 
+class PriorityTask(models.IntegerChoices):
+    """Перечисление приоритетов задач."""
+
+    LOW = 1, 'Низкий'
+    MEDIUM = 2, 'Средний'
+    HIGH = 3, 'Высокий'
+
+
+class TeamQuerySet(models.QuerySet):
+    """Запросы к командам."""
+
+    def for_api(self):
+        """Команды вместе с участниками для вложенного TeamSerializer."""
+        return self.prefetch_related('memberships__user')
+
+
+class TaskQuerySet(models.QuerySet):
+    """Запросы к задачам."""
+
+    def for_api(self):
+        """Задачи со всеми связями, которые отдает TaskSerializers."""
+        return self.select_related('author', 'executor', 'team')
+
+
+class CommentQuerySet(models.QuerySet):
+    """Запросы к комментариям."""
+
+    def for_api(self):
+        """Комментарии вместе с задачей и ее командой."""
+        return self.select_related(
+            'author', 'task__author', 'task__executor', 'task__team'
+        )
+
+
+class MeetingQuerySet(models.QuerySet):
+    """Запросы к встречам."""
+
+    def for_api(self):
+        """Встречи с участниками, автором и командой."""
+        return self.select_related(
+            'author', 'team'
+        ).prefetch_related('participants')
+
+    def for_user(self, user):
+        """Встречи, где пользователь участник или организатор."""
+        return self.filter(
+            models.Q(id__in=Meeting.participants.through.objects.filter(
+                user=user
+            ).values('meeting_id'))
+            | models.Q(author=user)
+        )
+
+    def in_period(self, start, end):
+        """Встречи и серии, у которых есть повторения в [start, end)."""
+        return self.filter(start_at__lt=end, series_end_at__gt=start)
+
+    def occurrences(self, start, end=None):
+        """Повторения встреч, пересекающие [start, end), по времени начала."""
+        return heapq.merge(
+            *(meeting.iter_occurrences(start, end) for meeting in self),
+            key=attrgetter('start_at', 'id')
+        )
+
+    def overlapping(self, start, end):
+        """Встречи, пересекающиеся с интервалом [start, end)."""
+        return self.filter(
+            models.Q(
+                rrule='',
+                start_at__gt=start - timedelta(
+                    minutes=constants.MAX_DURATION
+                ),
+                start_at__lt=end,
+                end_at__gt=start,
+            )
+            | (~models.Q(rrule='') & models.Q(
+                start_at__lt=end,
+                series_end_at__gt=start,
+            ))
+        )
+
+
 class Team(models.Model):
     title = models.CharField(
         max_length=constants.MAX_LENGTH_NAME_TEAME,
@@ -38,6 +126,13 @@ class Team(models.Model):
         verbose_name="Участники команды",
         help_text="Выберите участников для команды",
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='Время последнего изменения команды',
+        verbose_name='Изменена'
+    )
+
+    objects = TeamQuerySet.as_manager()
 
     class Meta:
         ordering = ['id']
@@ -65,6 +160,11 @@ class Membership(models.Model):
         choices=TeamRole.choices,
         default=TeamRole.PARTICIPANT
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='Время последнего изменения роли',
+        verbose_name='Изменено'
+    )
 
     class Meta:
         unique_together = ("user", "team")
@@ -102,6 +202,12 @@ class Task(models.Model):
         choices=StatusTask.choices,
         default=StatusTask.OPEN
     )
+    priority = models.PositiveSmallIntegerField(
+        verbose_name='Приоритет задачи',
+        help_text='Укажите приоритет задачи',
+        choices=PriorityTask.choices,
+        default=PriorityTask.MEDIUM
+    )
     executor = models.ForeignKey(
         User,
         help_text='Укажите исполнителя',
@@ -116,15 +222,83 @@ class Task(models.Model):
         related_name='tasks',
         verbose_name='Команда',
     )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text='Время создания задачи',
+        verbose_name='Создана'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='Время последнего изменения задачи',
+        verbose_name='Изменена'
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Заполняется триггером из названия и описания',
+        verbose_name='Поисковый вектор'
+    )
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            models.Index(
+                fields=['team', 'created_at', 'id'],
+                name='task_team_created_idx'
+            ),
+            models.Index(
+                fields=['team', 'deadline', 'id'],
+                name='task_team_deadline_idx'
+            ),
+            models.Index(
+                fields=['team', 'priority', 'id'],
+                name='task_team_priority_idx'
+            ),
+            models.Index(
+                fields=['team', 'status', 'created_at', 'id'],
+                name='task_team_status_created_idx'
+            ),
+            models.Index(
+                fields=['executor', 'created_at', 'id'],
+                name='task_executor_created_idx'
+            ),
+            models.Index(
+                fields=['executor', 'status'],
+                name='task_executor_status_idx'
+            ),
+            GinIndex(
+                fields=['search_vector'],
+                name='task_search_vector_idx'
+            ),
+        ]
         verbose_name = 'Задача'
         verbose_name_plural = 'Задачи'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Сохраняет задачу и обновляет счетчики команды; bulk-методы их обходят."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not (
+            {'team', 'team_id', 'status'} & set(update_fields)
+        ):
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = None
+            if self.pk is not None:
+                previous = Task.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('team_id', 'status').first()
+            super().save(*args, **kwargs)
+            if previous is None:
+                TeamTaskStats.add_task(self.team_id, self.status)
+            else:
+                self._previous_team_id = previous[0]
+                TeamTaskStats.move_task(*previous, self.team_id, self.status)
+
 
 class Evaluation(models.Model):
     task = models.ForeignKey(
@@ -161,6 +335,121 @@ class Evaluation(models.Model):
         return f'{self.task.team.title} - {self.task.title}'
 
 
+class ExecutorRatingStats(models.Model):
+    """Итоги оценок задач исполнителя."""
+
+    executor = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_stats',
+        verbose_name='Исполнитель',
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+    rating_1 = models.PositiveIntegerField(default=0, verbose_name='Оценок 1')
+    rating_2 = models.PositiveIntegerField(default=0, verbose_name='Оценок 2')
+    rating_3 = models.PositiveIntegerField(default=0, verbose_name='Оценок 3')
+    rating_4 = models.PositiveIntegerField(default=0, verbose_name='Оценок 4')
+    rating_5 = models.PositiveIntegerField(default=0, verbose_name='Оценок 5')
+
+    class Meta:
+        verbose_name = 'Статистика оценок'
+        verbose_name_plural = 'Статистика оценок'
+
+    def __str__(self):
+        return f'{self.executor} - {self.rating_count}'
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return 0.0
+        return round(self.rating_sum / self.rating_count, 2)
+
+    @property
+    def distribution(self):
+        return {
+            rating: getattr(self, f'rating_{rating}')
+            for rating in range(constants.MIN_RATING, constants.MAX_RATING + 1)
+        }
+
+    @classmethod
+    def for_executor(cls, executor):
+        """Итоги исполнителя; пустые, если его задачи еще не оценивали."""
+        return (
+            cls.objects.filter(executor=executor).first()
+            or cls(executor=executor)
+        )
+
+    @classmethod
+    def add_rating(cls, executor_id, rating, delta=1):
+        """Учесть оценку (delta=1) или снять ее (delta=-1)."""
+        if delta > 0:
+            cls.objects.get_or_create(executor_id=executor_id)
+        field = f'rating_{rating}'
+        cls.objects.filter(executor_id=executor_id).update(
+            rating_sum=models.F('rating_sum') + rating * delta,
+            rating_count=models.F('rating_count') + delta,
+            **{field: models.F(field) + delta}
+        )
+
+
+class TeamTaskStats(models.Model):
+    """Счетчики задач команды по статусам."""
+
+    team = models.OneToOneField(
+        Team,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_stats',
+        verbose_name='Команда',
+    )
+    open = models.PositiveIntegerField(default=0, verbose_name='Открыто')
+    progress = models.PositiveIntegerField(
+        default=0,
+        verbose_name='В работе'
+    )
+    completed = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Выполнено'
+    )
+
+    class Meta:
+        verbose_name = 'Счетчики задач'
+        verbose_name_plural = 'Счетчики задач'
+
+    def __str__(self):
+        return f'{self.team} - {self.open}/{self.progress}/{self.completed}'
+
+    @classmethod
+    def for_team(cls, team):
+        """Счетчики команды; нулевые, если задач еще не было."""
+        return cls.objects.filter(team=team).first() or cls(team=team)
+
+    @classmethod
+    def add_task(cls, team_id, status, delta=1):
+        """Учесть задачу в статусе (delta=1) или снять ее (delta=-1)."""
+        if delta > 0:
+            cls.objects.get_or_create(team_id=team_id)
+        cls.objects.filter(team_id=team_id).update(
+            **{status: models.F(status) + delta}
+        )
+
+    @classmethod
+    def move_task(cls, old_team_id, old_status, team_id, status):
+        """Перенести задачу между статусами или командами."""
+        if (old_team_id, old_status) == (team_id, status):
+            return
+        cls.add_task(old_team_id, old_status, delta=-1)
+        cls.add_task(team_id, status)
+
+
 class Comment(models.Model):
     text = models.TextField(
         help_text='Текст комментария',
@@ -185,8 +474,21 @@ class Comment(models.Model):
         help_text='Время создания комментария',
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='Время последнего изменения комментария',
+        verbose_name='Изменен'
+    )
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['task', 'created_at', 'id'],
+                name='comment_task_created_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
@@ -231,10 +533,57 @@ class Meeting(models.Model):
         related_name='meetings',
         help_text='Выберите участников для встречи',
     )
+    rrule = models.CharField(
+        max_length=constants.MAX_LENGTH_RRULE,
+        blank=True,
+        default='',
+        validators=[recurrence.validate_rrule],
+        verbose_name='Правило повторения',
+        help_text=(
+            'Подмножество RRULE: FREQ=DAILY|WEEKLY, INTERVAL, BYDAY, '
+            'COUNT или UNTIL. Пусто для разовой встречи'
+        ),
+    )
+    start_at = models.DateTimeField(
+        editable=False,
+        verbose_name='Начало',
+        help_text='Вычисляется из даты и времени встречи',
+    )
+    end_at = models.DateTimeField(
+        editable=False,
+        verbose_name='Окончание',
+        help_text='Вычисляется из начала и длительности встречи',
+    )
+    series_end_at = models.DateTimeField(
+        editable=False,
+        verbose_name='Окончание серии',
+        help_text='Окончание последнего повторения встречи',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text='Время последнего изменения встречи',
+        verbose_name='Изменена'
+    )
+
+    objects = MeetingQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Встреча'
         verbose_name_plural = 'Встречи'
+        indexes = [
+            models.Index(
+                fields=['start_at', 'end_at'],
+                name='meeting_period_idx'
+            ),
+            models.Index(
+                fields=['team', 'date', 'time'],
+                name='meeting_team_date_idx'
+            ),
+            models.Index(
+                fields=['start_at', 'series_end_at'],
+                name='meeting_series_period_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.date} - {self.time} - {self.duration}'
@@ -246,3 +595,50 @@ class Meeting(models.Model):
     def get_end_datetime(self):
         """Возвращает datetime окончания встречи"""
         return self.get_start_datetime() + timedelta(minutes=self.duration)
+
+    def get_rule(self):
+        """Разобранное правило повторения или None для разовой встречи."""
+        if not self.rrule:
+            return None
+        return recurrence.parse_rrule(self.rrule)
+
+    def iter_periods(self, start=None, end=None):
+        """Повторения встречи (начало, окончание), пересекающие [start, end)."""
+        duration = timedelta(minutes=self.duration)
+        for day in recurrence.iter_dates(self.date, self.get_rule()):
+            begin = timezone.make_aware(datetime.combine(day, self.time))
+            if end is not None and begin >= end:
+                return
+            if start is None or begin + duration > start:
+                yield begin, begin + duration
+
+    def iter_occurrences(self, start=None, end=None):
+        """Копии встречи для повторений, пересекающих [start, end)."""
+        for begin, _ in self.iter_periods(start, end):
+            yield self.as_occurrence(begin)
+
+    def as_occurrence(self, start):
+        """Копия встречи с датой и временем конкретного повторения."""
+        occurrence = copy.copy(self)
+        start = timezone.localtime(start)
+        occurrence.date = start.date()
+        occurrence.time = start.time()
+        occurrence.start_at = start
+        occurrence.end_at = start + timedelta(minutes=self.duration)
+        return occurrence
+
+    def save(self, *args, **kwargs):
+        self.start_at = timezone.make_aware(self.get_start_datetime())
+        self.end_at = timezone.make_aware(self.get_end_datetime())
+        periods = list(self.iter_periods())
+        self.series_end_at = periods[-1][1] if periods else self.end_at
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields,
+                'start_at',
+                'end_at',
+                'series_end_at',
+                'updated_at',
+            }
+        super().save(*args, **kwargs)
@@ -0,0 +1,154 @@
+"""Правила повторения встреч: подмножество RRULE из RFC 5545."""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import count, islice, takewhile
+
+from django.core.exceptions import ValidationError
+
+import teamflow.constants as constants
+
+DAILY = 'DAILY'
+WEEKLY = 'WEEKLY'
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Разобранное правило повторения."""
+
+    freq: str
+    interval: int = 1
+    weekdays: tuple = ()
+    count: int = None
+    until: date = None
+
+    def __str__(self):
+        parts = [f'FREQ={self.freq}']
+        if self.interval != 1:
+            parts.append(f'INTERVAL={self.interval}')
+        if self.weekdays:
+            parts.append('BYDAY=' + ','.join(
+                WEEKDAYS[day] for day in self.weekdays
+            ))
+        if self.count is not None:
+            parts.append(f'COUNT={self.count}')
+        if self.until is not None:
+            parts.append(f'UNTIL={self.until:%Y%m%d}')
+        return ';'.join(parts)
+
+
+def _positive(name, value):
+    if not value.isdigit() or int(value) < 1:
+        raise ValidationError(f'{name} должно быть целым числом больше нуля')
+    return int(value)
+
+
+def parse_rrule(value):
+    """Разбор строки вида FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10."""
+    params = {}
+    for part in value.upper().removeprefix('RRULE:').split(';'):
+        name, sep, param = part.strip().partition('=')
+        if not sep or not param or name in params:
+            raise ValidationError(f'Неверная часть правила: {part}')
+        params[name] = param
+    unknown = set(params) - {'FREQ', 'INTERVAL', 'BYDAY', 'COUNT', 'UNTIL'}
+    if unknown:
+        raise ValidationError(
+            f'Неподдерживаемые параметры: {", ".join(sorted(unknown))}'
+        )
+    freq = params.get('FREQ')
+    if freq not in (DAILY, WEEKLY):
+        raise ValidationError('FREQ должен быть DAILY или WEEKLY')
+    weekdays = ()
+    if 'BYDAY' in params:
+        if freq != WEEKLY:
+            raise ValidationError('BYDAY допустим только для FREQ=WEEKLY')
+        days = params['BYDAY'].split(',')
+        if not set(days) <= set(WEEKDAYS) or len(set(days)) != len(days):
+            raise ValidationError(f'Неверный BYDAY: {params["BYDAY"]}')
+        weekdays = tuple(sorted(WEEKDAYS.index(day) for day in days))
+    count = until = None
+    if 'COUNT' in params:
+        count = _positive('COUNT', params['COUNT'])
+    if 'UNTIL' in params:
+        try:
+            until = datetime.strptime(params['UNTIL'][:8], '%Y%m%d').date()
+        except ValueError:
+            raise ValidationError('UNTIL должен быть датой в формате ГГГГММДД')
+    if (count is None) == (until is None):
+        raise ValidationError('Нужно указать ровно одно из COUNT или UNTIL')
+    return Rule(
+        freq=freq,
+        interval=_positive('INTERVAL', params.get('INTERVAL', '1')),
+        weekdays=weekdays,
+        count=count,
+        until=until,
+    )
+
+
+def validate_rrule(value):
+    """Валидатор поля модели."""
+    if value:
+        parse_rrule(value)
+
+
+def _iter_series(first, rule):
+    """Даты серии по правилу без ограничения MAX_OCCURRENCES."""
+    if rule.freq == DAILY:
+        days = (
+            first + timedelta(days=number * rule.interval)
+            for number in count()
+        )
+    else:
+        weekdays = rule.weekdays or (first.weekday(),)
+        monday = first - timedelta(days=first.weekday())
+        days = (
+            monday + timedelta(weeks=week * rule.interval, days=weekday)
+            for week in count()
+            for weekday in weekdays
+        )
+    days = (day for day in days if day >= first)
+    if rule.count is not None:
+        days = islice(days, rule.count)
+    if rule.until is not None:
+        days = takewhile(lambda day: day <= rule.until, days)
+    return days
+
+
+def iter_dates(first, rule=None):
+    """Даты повторений, начиная с first, по одной."""
+    if rule is None:
+        return iter((first,))
+    return islice(_iter_series(first, rule), constants.MAX_OCCURRENCES)
+
+
+def check_series(first, rule):
+    """Проверка правила относительно первой даты серии."""
+    if rule.weekdays and first.weekday() not in rule.weekdays:
+        raise ValidationError('Дата встречи должна попадать в один из BYDAY')
+    if rule.until is not None and rule.until < first:
+        raise ValidationError('UNTIL не может быть раньше даты встречи')
+    dates = list(islice(
+        _iter_series(first, rule), constants.MAX_OCCURRENCES + 1
+    ))
+    if len(dates) > constants.MAX_OCCURRENCES:
+        raise ValidationError(
+            f'Серия не может быть длиннее {constants.MAX_OCCURRENCES} встреч'
+        )
+    return dates
+
+
+def overlaps(periods, others):
+    """Пересечения двух отсортированных списков интервалов [начало, конец)."""
+    first = second = 0
+    found = None
+    while first < len(periods) and second < len(others):
+        start, end = periods[first]
+        other_start, other_end = others[second]
+        if start < other_end and other_start < end and found != second:
+            found = second
+            yield others[second]
+        if end <= other_end:
+            first += 1
+        else:
+            second += 1
@@ -0,0 +1,136 @@
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from teamflow.cache import bump_team_versions
+from teamflow.models import (
+    Comment,
+    Evaluation,
+    ExecutorRatingStats,
+    Meeting,
+    Membership,
+    Task,
+    TeamTaskStats
+)
+
+
+def _deleted_with_task(origin):
+    """Строка удаляется каскадом вместе со своей задачей."""
+    if isinstance(origin, QuerySet):
+        return origin.model is Task
+    return isinstance(origin, Task)
+
+
+def _bump_once(origin, *team_ids):
+    """Версия команды меняется один раз на все строки одного удаления."""
+    if origin is not None:
+        bumped = origin.__dict__.setdefault('_bumped_team_ids', set())
+        team_ids = set(team_ids) - bumped
+        bumped.update(team_ids)
+    bump_team_versions(*team_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, origin=None, **kwargs):
+    """Задача могла перейти в другую команду: меняются версии обеих."""
+    _bump_once(
+        origin,
+        instance.team_id,
+        getattr(instance, '_previous_team_id', None)
+    )
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+def team_data_changed(sender, instance, origin=None, **kwargs):
+    _bump_once(origin, instance.team_id)
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def meeting_participants_changed(sender, instance, action, **kwargs):
+    """Участники встречи задаются после ее сохранения."""
+    if action.startswith('post_') and isinstance(instance, Meeting):
+        Meeting.objects.filter(pk=instance.pk).update(
+            updated_at=timezone.now()
+        )
+        bump_team_versions(instance.team_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Evaluation)
+@receiver(post_delete, sender=Evaluation)
+def task_data_changed(sender, instance, origin=None, **kwargs):
+    """Комментарий или оценка меняют данные команды своей задачи."""
+    if _deleted_with_task(origin):
+        return
+    if sender.task.is_cached(instance):
+        team_id = instance.task.team_id
+    else:
+        team_id = Task.objects.filter(
+            pk=instance.task_id
+        ).values_list('team_id', flat=True).first()
+    _bump_once(origin, team_id)
+
+
+@receiver(post_save, sender=Evaluation)
+@receiver(post_delete, sender=Evaluation)
+def evaluation_changed(sender, instance, origin=None, **kwargs):
+    """Оценка входит в ответ задачи (author_rating): меняется updated_at."""
+    if _deleted_with_task(origin):
+        return
+    Task.objects.filter(pk=instance.task_id).update(updated_at=timezone.now())
+
+
+def _executor_id(evaluation):
+    """Исполнитель задачи оценки без загрузки самой задачи."""
+    if Evaluation.task.is_cached(evaluation):
+        return evaluation.task.executor_id
+    return Task.objects.filter(
+        pk=evaluation.task_id
+    ).values_list('executor_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Evaluation)
+def evaluation_saving(sender, instance, **kwargs):
+    """Прежняя оценка запоминается, чтобы заменить ее в итогах."""
+    instance._previous_rating = None
+    if instance.pk is not None:
+        instance._previous_rating = Evaluation.objects.filter(
+            pk=instance.pk
+        ).values_list('rating', flat=True).first()
+
+
+@receiver(post_save, sender=Evaluation)
+def evaluation_saved(sender, instance, **kwargs):
+    """Новая или измененная оценка учитывается в итогах исполнителя."""
+    previous = getattr(instance, '_previous_rating', None)
+    if previous == instance.rating:
+        return
+    executor_id = _executor_id(instance)
+    if previous is not None:
+        ExecutorRatingStats.add_rating(executor_id, previous, delta=-1)
+    ExecutorRatingStats.add_rating(executor_id, instance.rating)
+
+
+@receiver(post_delete, sender=Evaluation)
+def evaluation_deleted(sender, instance, **kwargs):
+    """Оценка снимается с итогов исполнителя при любом удалении."""
+    ExecutorRatingStats.add_rating(
+        _executor_id(instance), instance.rating, delta=-1
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    """Задача снимается со счетчиков команды при любом удалении, и каскадном."""
+    TeamTaskStats.add_task(instance.team_id, instance.status, delta=-1)
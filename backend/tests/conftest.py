@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework.authtoken.models import Token
 
@@ -16,6 +17,12 @@ from teamflow.models import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш ответов не переходит из теста в тест."""
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Неавторизованный APIClient."""
@@ -1,11 +1,30 @@
+import csv
+import json
 from datetime import datetime, timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.test import APIClient
 
 from . import constants
-from teamflow.models import Membership, Team, TeamRole, Task, StatusTask
+from api.constants import USER_SEARCH_CANDIDATES
+from teamflow.cache import get_team_versions
+from teamflow.models import (
+    Comment,
+    Evaluation,
+    Meeting,
+    Membership,
+    Team,
+    TeamTaskStats,
+    PriorityTask,
+    TeamRole,
+    Task,
+    StatusTask,
+)
 
 
 pytestmark = pytest.mark.django_db
@@ -38,9 +57,195 @@ class TestUserPositive:
         token = response.data["auth_token"]
         assert token
 
+    def test_jwt_login(self, api_client, user_team, task_for_user):
+        """Тест входа по JWT и запроса без поиска пользователя в базе."""
+        response = api_client.post(
+            reverse("jwt-create"),
+            {"email": user_team.email, "password": 'passworduserteam'},
+            format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["refresh"]
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse("tasks-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["id"] == task_for_user.id
+        assert not [
+            query for query in context.captured_queries
+            if 'authtoken_token' in query['sql']
+            or 'WHERE "users_user"."id" = ' in query['sql']
+        ]
+
+    def test_jwt_create_task_loads_user_once(
+        self,
+        api_client,
+        manager_team,
+        user_team,
+        team_with_participants
+    ):
+        """По JWT профиль пользователя читается из базы одним запросом."""
+        response = api_client.post(
+            reverse("jwt-create"),
+            {"email": manager_team.email, "password": 'passwordmanager'},
+            format="json"
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+        data = {
+            "title": constants.TITLE_TASK,
+            "description": "Описание задачи",
+            "deadline": (datetime.now() + timedelta(days=1)).date(),
+            "executor_id": user_team.id,
+            "team_id": team_with_participants.id,
+            "status": StatusTask.OPEN
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(
+                reverse("tasks-list"), data, format="json"
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["author"]["username"] == manager_team.username
+        assert len([
+            query for query in context.captured_queries
+            if f'WHERE "users_user"."id" = {manager_team.id}' in query['sql']
+        ]) == constants.ONE_OBJECT
+
+    def test_jwt_get_me(self, api_client, user_team):
+        """Тест получения профиля по JWT."""
+        response = api_client.post(
+            reverse("jwt-create"),
+            {"email": user_team.email, "password": 'passworduserteam'},
+            format="json"
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+        response = api_client.get(reverse("users-get-me"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["email"] == user_team.email
+        assert response.data["username"] == user_team.username
+
+    def test_dashboard(
+        self,
+        auth_client_user_team,
+        user_team,
+        team_with_participants,
+        another_team_with_participants,
+        task_for_user,
+        meeting_for_team,
+    ):
+        """Тест сводки текущего пользователя."""
+        url = reverse("users-me-dashboard")
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["profile"]["email"] == user_team.email
+        assert [
+            (team["id"], team["role"]) for team in response.data["teams"]
+        ] == [(team_with_participants.id, TeamRole.PARTICIPANT)]
+        assert response.data["tasks"]["open"] == 0
+        assert response.data["upcoming_meetings"][0]["id"] == (
+            meeting_for_team.id
+        )
+        queries = len(context.captured_queries)
+
+        Membership.objects.create(
+            team=another_team_with_participants,
+            user=user_team
+        )
+        task_for_user.pk = None
+        task_for_user.status = StatusTask.OPEN
+        task_for_user.save()
+        meeting_for_team.pk = None
+        meeting_for_team.date += timedelta(days=1)
+        meeting_for_team.save()
+        meeting_for_team.participants.add(user_team)
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.get(url)
+        assert len(response.data["teams"]) == 2
+        assert response.data["tasks"]["open"] == 1
+        assert len(response.data["upcoming_meetings"]) == 2
+        assert len(context.captured_queries) == queries
+
+    def test_user_search(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        another_team_with_participants,
+        user_team,
+        user_another_team,
+    ):
+        """Тест автодополнения пользователей с ограничением по команде."""
+        url = reverse("users-search")
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.get(url, {"q": "USERTEAM"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]["id"] == user_team.id
+        assert [
+            query for query in context.captured_queries
+            if 'SIMILARITY(' in query['sql']
+            and f'LIMIT {USER_SEARCH_CANDIDATES})' in query['sql']
+        ]
+        response = auth_client_user_team.get(url, {"q": "another"})
+        assert user_another_team.id in [user["id"] for user in response.data]
+        response = auth_client_user_team.get(
+            url, {"q": "another", "team": team_with_participants.id}
+        )
+        assert response.data == []
+        response = auth_client_user_team.get(
+            url, {"q": "team", "team": team_with_participants.id}
+        )
+        assert sorted(user["id"] for user in response.data) == sorted(
+            team_with_participants.participants.values_list("id", flat=True)
+        )
+        response = auth_client_user_team.get(url, {"q": "mail.ru", "limit": 2})
+        assert len(response.data) == 2
+
+    def test_user_search_exact_match_beyond_candidates(
+        self,
+        auth_client_user_team,
+        django_user_model,
+    ):
+        """Тест на точное совпадение, когда подстрок больше предела выборки."""
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'ivan{number}',
+                email=f'ivan{number}@mail.ru',
+                password='password',
+            )
+            for number in range(USER_SEARCH_CANDIDATES + 1)
+        )
+        ivan = django_user_model.objects.create_user(
+            email='petrov@mail.ru', username='ivan', password='password'
+        )
+        response = auth_client_user_team.get(
+            reverse("users-search"), {"q": "IVAN", "limit": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [user["id"] for user in response.data] == [ivan.id]
+
 
 class TestUserNegative:
     """Набор негативных тестов по работе с пользователями."""
+    def test_jwt_inactive_user(self, api_client, user_team):
+        """Заблокированный пользователь не проходит по старому JWT."""
+        response = api_client.post(
+            reverse("jwt-create"),
+            {"email": user_team.email, "password": 'passworduserteam'},
+            format="json"
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+        user_team.is_active = False
+        user_team.save()
+        response = api_client.get(reverse("users-get-me"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
     @pytest.mark.parametrize(
         'email,username,password',
         [
@@ -62,6 +267,21 @@ class TestUserNegative:
         response = api_client.post(url, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_user_search_invalid_params(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        another_team_with_participants,
+    ):
+        """Тест поиска с короткой строкой и чужой командой."""
+        url = reverse("users-search")
+        response = auth_client_user_team.get(url, {"q": "us"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = auth_client_user_team.get(
+            url, {"q": "user", "team": another_team_with_participants.id}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     @pytest.mark.parametrize(
         'email,password',
         [
@@ -158,14 +378,134 @@ class TestTeamPositive:
                 in response.data["status"])
         assert manager_team not in team_with_participants.participants.all()
 
+    def test_admin_add_participants_bulk(
+        self,
+        auth_client_admin_team,
+        team_without_participants,
+        admin_team,
+        manager_team,
+        user_team
+    ):
+        """Тест на массовое добавление участников в команду."""
+        url = reverse(
+            "teams-add-participants",
+            args=[team_without_participants.id]
+        )
+        data = {
+            "participants": [
+                {"user_id": manager_team.id, "role": TeamRole.MANAGER},
+                {"user_id": user_team.id},
+                {"user_id": admin_team.id, "role": TeamRole.PARTICIPANT},
+                {"user_id": 999999, "role": TeamRole.PARTICIPANT},
+            ]
+        }
+        response = auth_client_admin_team.put(url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "added": sorted([manager_team.id, user_team.id]),
+            "skipped": [admin_team.id],
+            "rejected": [999999],
+        }
+        roles = dict(Membership.objects.filter(
+            team=team_without_participants
+        ).values_list("user_id", "role"))
+        assert roles == {
+            admin_team.id: TeamRole.ADMIN,
+            manager_team.id: TeamRole.MANAGER,
+            user_team.id: TeamRole.PARTICIPANT,
+        }
+
+    def test_admin_add_participants_bulk_query_count(
+        self,
+        auth_client_admin_team,
+        team_without_participants,
+        django_user_model,
+        django_assert_max_num_queries
+    ):
+        """Число запросов не зависит от количества добавляемых."""
+        users = django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f"bulkuser{number}",
+                email=f"bulkuser{number}@mail.ru"
+            )
+            for number in range(30)
+        )
+        url = reverse(
+            "teams-add-participants",
+            args=[team_without_participants.id]
+        )
+        data = {"participants": [{"user_id": user.id} for user in users]}
+        with django_assert_max_num_queries(8):
+            response = auth_client_admin_team.put(url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["added"]) == len(users)
+
+    def test_admin_remove_participants_bulk(
+        self,
+        auth_client_admin_team,
+        team_with_participants,
+        manager_team,
+        user_team,
+        user_another_team
+    ):
+        """Тест на массовое удаление участников из команды."""
+        url = reverse(
+            "teams-remove-participants",
+            args=[team_with_participants.id]
+        )
+        data = {
+            "user_ids": [manager_team.id, user_team.id, user_another_team.id]
+        }
+        team_id = team_with_participants.id
+        version = get_team_versions([team_id])[team_id]
+        response = auth_client_admin_team.delete(url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert get_team_versions([team_id])[team_id] == version + 1
+        assert response.data == {
+            "removed": sorted([manager_team.id, user_team.id]),
+            "skipped": [user_another_team.id],
+        }
+        assert not team_with_participants.participants.filter(
+            id__in=[manager_team.id, user_team.id]
+        ).exists()
+
+    def test_team_list_cache_follows_membership(
+        self,
+        auth_client_admin_team,
+        team_without_participants,
+        manager_team
+    ):
+        """Тест на сброс кеша списка команд при изменении состава."""
+        url = reverse("teams-list")
+        response = auth_client_admin_team.get(url)
+        assert response.data["results"][0]["participant_count"] == 1
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_admin_team.get(url)
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "teamflow_team"' in query["sql"]
+        ]
+        auth_client_admin_team.put(
+            reverse(
+                "teams-add-participants",
+                args=[team_without_participants.id]
+            ),
+            {"participants": [{"user_id": manager_team.id}]},
+            format="json"
+        )
+        response = auth_client_admin_team.get(url)
+        assert response.data["results"][0]["participant_count"] == 2
+
     def test_admin_get_team(
         self,
         auth_client_admin_team,
         team_with_participants
     ):
-        """Тест на получения команды."""
+        """Тест на получения команды с полным составом."""
         url = reverse("teams-list")
-        response = auth_client_admin_team.get(url)
+        response = auth_client_admin_team.get(
+            url, {"expand": "participants"}
+        )
         assert response.status_code == status.HTTP_200_OK
         data = response.data
         assert data["count"] == constants.ONE_OBJECT
@@ -181,6 +521,140 @@ class TestTeamPositive:
         ]
         assert sorted(api_participants) == sorted(db_participants)
 
+    def test_get_team_summary(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+    ):
+        """Тест на краткое представление команды без участников."""
+        url = reverse("teams-detail", args=[team_with_participants.id])
+        response = auth_client_user_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "id": team_with_participants.id,
+            "title": team_with_participants.title,
+            "participant_count": team_with_participants.memberships.count(),
+            "my_role": TeamRole.PARTICIPANT,
+        }
+
+    def test_get_team_members(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        manager_team,
+    ):
+        """Тест на постраничный список участников с фильтрами."""
+        url = reverse("teams-members", args=[team_with_participants.id])
+        emails = []
+        response = auth_client_user_team.get(url, {"page_size": 2})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            emails += [
+                member["user"]["email"] for member in response.data["results"]
+            ]
+            if response.data["next"] is None:
+                break
+            response = auth_client_user_team.get(response.data["next"])
+        assert emails == [
+            membership.user.email
+            for membership in team_with_participants.memberships.order_by(
+                "id"
+            )
+        ]
+        response = auth_client_user_team.get(url, {"role": TeamRole.MANAGER})
+        assert [
+            member["user"]["email"] for member in response.data["results"]
+        ] == [manager_team.email]
+        response = auth_client_user_team.get(
+            url, {"search": manager_team.username.upper()}
+        )
+        assert [
+            member["user"]["email"] for member in response.data["results"]
+        ] == [manager_team.email]
+
+    def test_team_task_stats(
+        self,
+        auth_client_manager_team,
+        auth_client_user_team,
+        team_with_participants,
+        manager_team,
+        user_team,
+    ):
+        """Тест на счетчики задач, которые ведутся при записи."""
+        task_ids = []
+        for days in (-1, 1, 2):
+            response = auth_client_manager_team.post(reverse("tasks-list"), {
+                "title": constants.TITLE_TASK,
+                "description": "Описание задачи",
+                "deadline": (datetime.now() + timedelta(days=days)).date(),
+                "executor_id": user_team.id,
+                "team_id": team_with_participants.id,
+                "status": StatusTask.OPEN
+            }, format="json")
+            task_ids.append(response.data["id"])
+        auth_client_user_team.put(
+            reverse("tasks-update-status", args=[task_ids[1]]),
+            {"status": StatusTask.PROGRESS},
+            format="json"
+        )
+        auth_client_user_team.put(
+            reverse("tasks-update-status", args=[task_ids[2]]),
+            {"status": StatusTask.COMPLETED},
+            format="json"
+        )
+        url = reverse("teams-stats", args=[team_with_participants.id])
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "open": 1, "progress": 1, "completed": 1, "overdue": 1
+        }
+        assert not [
+            query for query in context.captured_queries
+            if 'GROUP BY' in query['sql']
+        ]
+        Task.objects.get(id=task_ids[0]).delete()
+        response = auth_client_user_team.get(url)
+        assert response.data == {
+            "open": 0, "progress": 1, "completed": 1, "overdue": 0
+        }
+        manager_team.delete()
+        response = auth_client_user_team.get(url)
+        assert response.data == {
+            "open": 0, "progress": 0, "completed": 0, "overdue": 0
+        }
+
+    def test_export_team_tasks(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        task_for_user,
+        completed_task_user,
+    ):
+        """Тест на потоковую выгрузку задач команды в NDJSON и CSV."""
+        url = reverse("teams-export-tasks", args=[team_with_participants.id])
+        response = auth_client_user_team.get(url, {"format": "ndjson"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"].startswith("application/x-ndjson")
+        rows = [
+            json.loads(line) for line in
+            b"".join(response.streaming_content).decode().splitlines()
+        ]
+        assert [row["id"] for row in rows] == sorted(
+            [task_for_user.id, completed_task_user.id]
+        )
+        assert rows[0]["executor__username"] == task_for_user.executor.username
+        response = auth_client_user_team.get(url, {"format": "csv"})
+        assert response.status_code == status.HTTP_200_OK
+        rows = list(csv.DictReader(
+            b"".join(response.streaming_content).decode().splitlines()
+        ))
+        assert [int(row["id"]) for row in rows] == sorted(
+            [task_for_user.id, completed_task_user.id]
+        )
+        assert rows[1]["status"] == StatusTask.COMPLETED
+
     def test_admin_get_role(
         self,
         auth_client_admin_team,
@@ -198,6 +672,46 @@ class TestTeamPositive:
             user=admin_team.id
         ).role
 
+    def test_my_roles(
+        self,
+        auth_client_admin_team,
+        auth_client_user_team,
+        team_with_participants,
+        another_team_with_participants,
+        admin_team,
+        user_team,
+    ):
+        """Тест на получение ролей во всех командах с ETag."""
+        Membership.objects.create(
+            team=another_team_with_participants,
+            user=user_team,
+            role=TeamRole.MANAGER
+        )
+        url = reverse("teams-my-roles")
+        response = auth_client_user_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["roles"] == {
+            team_with_participants.id: TeamRole.PARTICIPANT,
+            another_team_with_participants.id: TeamRole.MANAGER,
+        }
+        etag = response["ETag"]
+        response = auth_client_user_team.get(
+            url, {"ids": str(team_with_participants.id)}
+        )
+        assert response.data["roles"] == {
+            team_with_participants.id: TeamRole.PARTICIPANT
+        }
+        response = auth_client_user_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        auth_client_admin_team.put(
+            reverse("teams-change-role", args=[team_with_participants.id]),
+            {"user_id": user_team.id, "role": TeamRole.MANAGER},
+            format="json"
+        )
+        response = auth_client_user_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
 
 class TestTeamNegative:
     """Набор негативных тестов по работе с командами."""
@@ -263,6 +777,64 @@ class TestTeamNegative:
         response = auth_client_admin_team.put(url, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"participants": []},
+            {"participants": [{"user_id": 1, "role": "owner"}]},
+            {"participants": [{"role": TeamRole.MANAGER}]},
+            {},
+        ]
+    )
+    def test_admin_add_participants_bulk_invalid_data(
+        self,
+        auth_client_admin_team,
+        team_without_participants,
+        data
+    ):
+        """Тест на массовое добавление участников с невалидными данными."""
+        url = reverse(
+            "teams-add-participants",
+            args=[team_without_participants.id]
+        )
+        response = auth_client_admin_team.put(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert team_without_participants.participants.count() == 1
+
+    @pytest.mark.parametrize(
+        "client_fixture_name",
+        [
+            ("auth_client_manager_team"),
+            ("auth_client_user_team"),
+        ]
+    )
+    def test_not_admin_bulk_participants(
+        self,
+        team_with_participants,
+        user_another_team,
+        admin_team,
+        client_fixture_name,
+        request
+    ):
+        """Массово менять состав команды может только админ."""
+        client = request.getfixturevalue(client_fixture_name)
+        url = reverse(
+            "teams-add-participants",
+            args=[team_with_participants.id]
+        )
+        data = {"participants": [{"user_id": user_another_team.id}]}
+        response = client.put(url, data, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        url = reverse(
+            "teams-remove-participants",
+            args=[team_with_participants.id]
+        )
+        response = client.delete(
+            url, {"user_ids": [admin_team.id]}, format="json"
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert team_with_participants.participants.count() == 3
+
     @pytest.mark.parametrize(
         "user_fixture_name",
         [
@@ -289,6 +861,46 @@ class TestTeamNegative:
         response = auth_client_admin_team.delete(url, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_get_team_members_invalid(
+        self,
+        auth_client_admin_team,
+        team_with_participants,
+        another_team_with_participants,
+    ):
+        """Тест на участников чужой команды и неверную роль в фильтре."""
+        response = auth_client_admin_team.get(reverse(
+            "teams-members", args=[another_team_with_participants.id]
+        ))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = auth_client_admin_team.get(
+            reverse("teams-members", args=[team_with_participants.id]),
+            {"role": "owner"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_team_tasks_invalid(
+        self,
+        auth_client_admin_team,
+        team_with_participants,
+        another_team_with_participants,
+    ):
+        """Тест на выгрузку чужой команды и неизвестный формат."""
+        response = auth_client_admin_team.get(reverse(
+            "teams-export-tasks", args=[another_team_with_participants.id]
+        ), {"format": "csv"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = auth_client_admin_team.get(reverse(
+            "teams-export-tasks", args=[team_with_participants.id]
+        ), {"format": "xml"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_my_roles_invalid_ids(self, auth_client_admin_team):
+        """Тест на получение ролей с невалидным списком команд."""
+        response = auth_client_admin_team.get(
+            reverse("teams-my-roles"), {"ids": "1,команда"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_admin_get_team_another_team(
         self,
         auth_client_admin_team,
@@ -317,7 +929,7 @@ class TestTaskPositive:
         url = reverse("tasks-list")
         response = auth_client_user_team.get(url)
         assert response.status_code == status.HTTP_200_OK
-        data = response.data
+        data = response.data["results"]
         assert len(data) == constants.ONE_OBJECT
         task_data = data[0]
         assert task_data["title"] == task_for_user.title
@@ -350,19 +962,172 @@ class TestTaskPositive:
         tasks = Task.objects.all()
         assert len(tasks) == constants.ONE_OBJECT
 
-    def test_update_status_task(
+    def test_manager_bulk_create_tasks(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        user_team,
+        admin_team,
+    ):
+        """Тест на массовое создание задач за постоянное число запросов."""
+        url = reverse("tasks-bulk-create")
+
+        def create(total):
+            data = [
+                {
+                    "title": f"Задача {number}",
+                    "description": "Описание задачи",
+                    "deadline": (datetime.now() + timedelta(days=1)).date(),
+                    "executor_id": (user_team, admin_team)[number % 2].id,
+                    "team_id": team_with_participants.id,
+                }
+                for number in range(total)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client_manager_team.post(
+                    url, data, format="json"
+                )
+            assert response.status_code == status.HTTP_201_CREATED
+            assert [task["title"] for task in response.data] == [
+                item["title"] for item in data
+            ]
+            return len(context.captured_queries)
+
+        create(1)
+        assert create(2) == create(20)
+        assert Task.objects.filter(
+            team=team_with_participants, status=StatusTask.OPEN
+        ).count() == 23
+        response = auth_client_manager_team.get(
+            reverse("teams-stats", args=[team_with_participants.id])
+        )
+        assert response.data["open"] == 23
+
+    def test_bulk_update_status(
         self,
         auth_client_user_team,
+        team_with_participants,
         task_for_user,
+        completed_task_user,
+        manager_team,
+        user_team,
     ):
-        """Тест на обновление статуса задачи."""
-        url = reverse("tasks-update-status", args=[task_for_user.id])
-        data = {
-            "status": StatusTask.PROGRESS
-        }
-        response = auth_client_user_team.put(url, data, format="json")
+        """Тест на смену статуса у нескольких задач одним UPDATE."""
+        url = reverse("tasks-bulk-status")
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.put(url, {
+                "ids": [task_for_user.id, completed_task_user.id],
+                "status": StatusTask.PROGRESS,
+            }, format="json")
         assert response.status_code == status.HTTP_200_OK
-        assert response.data["status"] == StatusTask.PROGRESS
+        assert response.data["updated"] == 2
+        assert len([
+            query for query in context.captured_queries
+            if query["sql"].startswith('UPDATE "teamflow_task"')
+        ]) == constants.ONE_OBJECT
+        assert set(Task.objects.values_list("status", flat=True)) == {
+            StatusTask.PROGRESS
+        }
+        response = auth_client_user_team.get(
+            reverse("teams-stats", args=[team_with_participants.id])
+        )
+        assert response.data["progress"] == 2
+        assert response.data["completed"] == 0
+
+    def test_task_list_cache_follows_team_version(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        task_for_user,
+        completed_task_user,
+    ):
+        """Тест на кеш списка задач и его сброс при изменениях."""
+        url = reverse("tasks-list") + f"?team={team_with_participants.id}"
+
+        def get_statuses():
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client_user_team.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            task_queries = [
+                query for query in context.captured_queries
+                if 'FROM "teamflow_task"' in query["sql"]
+                and 'MAX("teamflow_task"."updated_at")' not in query["sql"]
+            ]
+            return {
+                task["id"]: task["status"]
+                for task in response.data["results"]
+            }, len(task_queries)
+
+        statuses, queries = get_statuses()
+        assert queries > 0
+        assert get_statuses() == (statuses, 0)
+        task_for_user.title = "Новое название"
+        task_for_user.save()
+        assert get_statuses()[1] == queries
+        auth_client_user_team.put(reverse("tasks-bulk-status"), {
+            "ids": [task_for_user.id],
+            "status": StatusTask.PROGRESS,
+        }, format="json")
+        statuses, _ = get_statuses()
+        assert statuses[task_for_user.id] == StatusTask.PROGRESS
+
+    def test_task_delete_bumps_team_version_once(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        completed_task_user,
+        manager_team,
+        user_team,
+    ):
+        """Тест на удаление задачи без обработки каждой связанной строки."""
+        url = reverse("tasks-list") + f"?team={team_with_participants.id}"
+        assert len(auth_client_user_team.get(url).data["results"]) == 1
+        for user in (manager_team, user_team, manager_team):
+            Comment.objects.create(
+                text='Комментарий', task=completed_task_user, author=user
+            )
+        Evaluation.objects.create(
+            task=completed_task_user, evaluator=manager_team, rating=5
+        )
+        with CaptureQueriesContext(connection) as context:
+            completed_task_user.delete()
+        assert not [
+            query for query in context.captured_queries
+            if query["sql"].startswith('SELECT "teamflow_task"."team_id"')
+            or query["sql"].startswith('UPDATE "teamflow_task"')
+        ]
+        assert auth_client_user_team.get(url).data["results"] == []
+
+    def test_update_status_task(
+        self,
+        auth_client_user_team,
+        task_for_user,
+    ):
+        """Тест на обновление статуса задачи."""
+        url = reverse("tasks-update-status", args=[task_for_user.id])
+        data = {
+            "status": StatusTask.PROGRESS
+        }
+        response = auth_client_user_team.put(url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == StatusTask.PROGRESS
+
+    def test_update_status_loads_memberships_once(
+        self,
+        auth_client_user_team,
+        task_for_user,
+    ):
+        """Роли пользователя загружаются один раз за запрос."""
+        url = reverse("tasks-update-status", args=[task_for_user.id])
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.put(
+                url, {"status": StatusTask.PROGRESS}, format="json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert len([
+            query for query in context.captured_queries
+            if '"teamflow_membership"."user_id" =' in query['sql']
+        ]) == constants.ONE_OBJECT
 
     def test_evaluate_task(
         self,
@@ -381,6 +1146,268 @@ class TestTaskPositive:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["rating"] == 4
 
+    def test_task_list_and_detail_etag(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        completed_task_user,
+        task_for_user,
+    ):
+        """Тест на 304 для неизмененных списка и задачи."""
+        url = reverse("tasks-list") + f"?team={team_with_participants.id}"
+        response = auth_client_manager_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.data is None
+        detail = reverse("tasks-detail", args=[completed_task_user.id])
+        detail_etag = auth_client_manager_team.get(detail)["ETag"]
+        response = auth_client_manager_team.get(
+            detail, HTTP_IF_NONE_MATCH=detail_etag
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        auth_client_manager_team.post(
+            reverse("tasks-evaluate-task", args=[completed_task_user.id]),
+            {"rating": 5},
+            format="json"
+        )
+        response = auth_client_manager_team.get(
+            detail, HTTP_IF_NONE_MATCH=detail_etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["author_rating"] == 5
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_executor_evaluations_use_stats(
+        self,
+        auth_client_manager_team,
+        auth_client_user_team,
+        completed_task_user,
+        manager_team,
+        user_team,
+    ):
+        """Тест на итоги оценок без агрегата и список с кратким видом задачи."""
+        second_task = Task.objects.create(
+            author=manager_team,
+            title='Вторая задача',
+            description='Описание задачи',
+            deadline=(datetime.now() + timedelta(days=1)).date(),
+            executor=user_team,
+            team=completed_task_user.team,
+            status=StatusTask.COMPLETED
+        )
+        for task, rating in ((completed_task_user, 5), (second_task, 2)):
+            auth_client_manager_team.post(
+                reverse("tasks-evaluate-task", args=[task.id]),
+                {"rating": rating},
+                format="json"
+            )
+        url = reverse("users-executor-evaluations")
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.get(url, {"page_size": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["average_rating"] == 3.5
+        assert response.data["total_evaluations"] == 2
+        assert response.data["distribution"] == {
+            "1": 0, "2": 1, "3": 0, "4": 0, "5": 1
+        }
+        assert not [
+            query for query in context.captured_queries
+            if 'AVG(' in query['sql'] or 'COUNT(' in query['sql']
+        ]
+        evaluation = response.data["evaluations"][0]
+        assert evaluation["rating"] == 2
+        assert set(evaluation["task"]) == {
+            "id", "title", "status", "deadline", "team"
+        }
+        response = auth_client_user_team.get(response.data["next"])
+        assert [
+            evaluation["rating"] for evaluation in response.data["evaluations"]
+        ] == [5]
+        assert response.data["next"] is None
+
+    def test_executor_evaluations_after_cascade_delete(
+        self,
+        auth_client_manager_team,
+        auth_client_user_team,
+        completed_task_user,
+        manager_team,
+    ):
+        """Тест на итоги оценок после удаления автора оценки."""
+        auth_client_manager_team.post(
+            reverse("tasks-evaluate-task", args=[completed_task_user.id]),
+            {"rating": 4},
+            format="json"
+        )
+        url = reverse("users-executor-evaluations")
+        response = auth_client_user_team.get(url)
+        assert response.data["total_evaluations"] == constants.ONE_OBJECT
+        manager_team.delete()
+        response = auth_client_user_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_evaluations"] == 0
+        assert response.data["average_rating"] == 0
+        assert response.data["distribution"]["4"] == 0
+
+    def test_executor_evaluations_follow_orm_changes(
+        self,
+        auth_client_user_team,
+        completed_task_user,
+        manager_team,
+    ):
+        """Тест на итоги оценок при создании, правке и удалении через ORM."""
+        url = reverse("users-executor-evaluations")
+        evaluation = Evaluation.objects.create(
+            task=completed_task_user, evaluator=manager_team, rating=2
+        )
+        evaluation.rating = 5
+        evaluation.save()
+        response = auth_client_user_team.get(url)
+        assert response.data["total_evaluations"] == constants.ONE_OBJECT
+        assert response.data["distribution"]["2"] == 0
+        assert response.data["distribution"]["5"] == constants.ONE_OBJECT
+        Evaluation.objects.filter(pk=evaluation.pk).delete()
+        response = auth_client_user_team.get(url)
+        assert response.data["total_evaluations"] == 0
+        assert response.data["distribution"]["5"] == 0
+
+    def test_task_list_queries_do_not_depend_on_size(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        manager_team,
+        user_team,
+    ):
+        """Тест на постоянное число запросов к списку задач."""
+        url = reverse("tasks-list")
+
+        def count_queries(total):
+            Task.objects.all().delete()
+            tasks = Task.objects.bulk_create(
+                Task(
+                    author=manager_team,
+                    title=f'Задача {number}',
+                    description='Описание задачи',
+                    deadline=(datetime.now() + timedelta(days=1)).date(),
+                    executor=user_team,
+                    team=team_with_participants,
+                    status=StatusTask.COMPLETED,
+                )
+                for number in range(total)
+            )
+            TeamTaskStats.add_task(
+                team_with_participants.id, StatusTask.COMPLETED, delta=total
+            )
+            Evaluation.objects.create(
+                task=tasks[-1],
+                evaluator=manager_team,
+                rating=5
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client_user_team.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            first_task = response.data['results'][0]
+            assert first_task['id'] == tasks[-1].id
+            assert first_task['author_rating'] == 5
+            assert first_task['my_role'] == TeamRole.PARTICIPANT
+            return len(context.captured_queries)
+
+        assert count_queries(10) == count_queries(10000)
+
+    def test_task_full_text_search(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        task_another_team,
+        manager_team,
+        user_team,
+    ):
+        """Тест на полнотекстовый поиск задач с ранжированием."""
+        def create_task(title, description):
+            return Task.objects.create(
+                author=manager_team,
+                title=title,
+                description=description,
+                deadline=(datetime.now() + timedelta(days=1)).date(),
+                executor=user_team,
+                team=team_with_participants,
+            )
+
+        in_description = create_task('Отчет', 'Подготовить релизы к понедельнику')
+        in_title = create_task('Релиз мобильного приложения', 'Собрать сборку')
+        create_task('Созвон', 'Обсудить планы')
+        task_another_team.title = 'Релиз чужой команды'
+        task_another_team.save()
+        url = reverse("tasks-list")
+        response = auth_client_user_team.get(url, {"q": "релизы"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["id"] for task in response.data["results"]] == [
+            in_title.id, in_description.id
+        ]
+        response = auth_client_user_team.get(url, {"q": "релиз", "page_size": 1})
+        received = [task["id"] for task in response.data["results"]]
+        response = auth_client_user_team.get(response.data["next"])
+        received += [task["id"] for task in response.data["results"]]
+        assert received == [in_title.id, in_description.id]
+        assert response.data["next"] is None
+
+    @pytest.mark.parametrize(
+        'ordering',
+        ['-created_at', 'deadline', '-priority', 'priority,-deadline']
+    )
+    def test_task_list_cursor_pagination(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        manager_team,
+        user_team,
+        ordering,
+    ):
+        """Тест на обход всех страниц задач по курсору."""
+        Task.objects.bulk_create(
+            Task(
+                author=manager_team,
+                title=f'Задача {number}',
+                description='Описание задачи',
+                deadline=(
+                    datetime.now() + timedelta(days=number % 3)
+                ).date(),
+                executor=user_team,
+                team=team_with_participants,
+                status=[StatusTask.OPEN, StatusTask.PROGRESS][number % 2],
+                priority=[
+                    PriorityTask.LOW, PriorityTask.MEDIUM, PriorityTask.HIGH
+                ][number % 3],
+            )
+            for number in range(11)
+        )
+        order_by = ordering.split(',')
+        tiebreaker = '-id' if order_by[-1].startswith('-') else 'id'
+        expected = list(
+            Task.objects.filter(status=StatusTask.OPEN).order_by(
+                *order_by, tiebreaker
+            ).values_list('id', flat=True)
+        )
+        url = reverse("tasks-list")
+        params = {
+            'team': team_with_participants.id,
+            'status': StatusTask.OPEN,
+            'ordering': ordering,
+            'page_size': 2,
+        }
+        response = auth_client_user_team.get(url, params)
+        received = []
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            received += [task['id'] for task in response.data['results']]
+            if not response.data['next']:
+                break
+            response = auth_client_user_team.get(response.data['next'])
+        assert received == expected
+
 
 class TestTaskNegative:
     """Набор негативных тестов по работе с задачами."""
@@ -491,6 +1518,67 @@ class TestTaskNegative:
         response = auth_client_manager_team.post(url, data, format="json")
         assert response.status_code == expected_status
 
+    def test_bulk_create_tasks_reports_item_errors(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        another_team_with_participants,
+        user_team,
+        user_another_team,
+        manager_team,
+    ):
+        """Тест на ошибки по каждой задаче без частичного создания."""
+        item = {
+            "title": "Задача",
+            "description": "Описание задачи",
+            "deadline": (datetime.now() + timedelta(days=1)).date(),
+            "executor_id": user_team.id,
+            "team_id": team_with_participants.id,
+        }
+        data = [
+            item,
+            {**item, "executor_id": user_another_team.id},
+            {**item, "team_id": another_team_with_participants.id},
+            {**item, "executor_id": manager_team.id},
+        ]
+        url = reverse("tasks-bulk-create")
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [sorted(error) for error in response.data] == [
+            [], ["executor_id"], ["team_id"], ["executor_id"]
+        ]
+        response = auth_client_manager_team.post(
+            url, [item, {**item, "status": "unknown"}], format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [sorted(error) for error in response.data] == [[], ["status"]]
+        response = auth_client_manager_team.post(url, [], format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Task.objects.exists()
+
+    def test_bulk_update_status_forbidden(
+        self,
+        auth_client_admin_team,
+        task_for_user,
+        task_another_team,
+    ):
+        """Тест на смену статуса чужих и недоступных задач."""
+        url = reverse("tasks-bulk-status")
+        response = auth_client_admin_team.put(url, {
+            "ids": [task_for_user.id],
+            "status": StatusTask.OPEN,
+        }, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert list(map(int, response.data["ids"])) == [task_for_user.id]
+        response = auth_client_admin_team.put(url, {
+            "ids": [task_for_user.id, task_another_team.id],
+            "status": StatusTask.OPEN,
+        }, format="json")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert list(map(int, response.data["ids"])) == [task_another_team.id]
+        task_for_user.refresh_from_db()
+        assert task_for_user.status == StatusTask.COMPLETED
+
 
 class TestCommentPositive:
     """Набор положительных тестов для комментов задач."""
@@ -507,7 +1595,100 @@ class TestCommentPositive:
         )
         response = auth_client_manager_team.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert response.data[0]["text"] == comment_for_task.text
+        assert response.data["results"][0]["text"] == comment_for_task.text
+
+    def test_get_comment_list_is_compact(
+        self,
+        auth_client_manager_team,
+        task_for_user,
+        comment_for_task
+    ):
+        """Тест на краткий вид комментариев в списке."""
+        url = reverse(
+            "task-comments",
+            args=[task_for_user.id]
+        )
+        response = auth_client_manager_team.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        comment_data = response.data["results"][0]
+        assert comment_data["task_id"] == task_for_user.id
+        assert "task" not in comment_data
+
+    def test_get_comment_cursor_pagination(
+        self,
+        auth_client_manager_team,
+        task_for_user,
+        user_team
+    ):
+        """Тест на обход всех страниц комментариев по курсору."""
+        comments = Comment.objects.bulk_create(
+            Comment(
+                text=f'Комментарий {number}',
+                task=task_for_user,
+                author=user_team
+            )
+            for number in range(5)
+        )
+        Comment.objects.filter(
+            id__in=[comment.id for comment in comments[1:3]]
+        ).update(created_at=comments[1].created_at)
+        expected = list(
+            Comment.objects.order_by('-created_at', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        url = reverse(
+            "task-comments",
+            args=[task_for_user.id]
+        ) + "?page_size=2"
+        received = []
+        while url:
+            response = auth_client_manager_team.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            received += [comment["id"] for comment in response.data["results"]]
+            url = response.data["next"]
+        assert received == expected
+
+    def test_comment_list_etag(
+        self,
+        auth_client_manager_team,
+        task_for_user,
+        comment_for_task
+    ):
+        """Новый комментарий меняет ETag списка."""
+        url = reverse("task-comments", args=[task_for_user.id])
+        etag = auth_client_manager_team.get(url)["ETag"]
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        auth_client_manager_team.post(url, {"text": "Еще"}, format="json")
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+
+    def test_comment_detail_etag_follows_task(
+        self,
+        auth_client_manager_team,
+        task_for_user,
+        comment_for_task
+    ):
+        """Изменение задачи или команды меняет ETag комментария."""
+        url = reverse(
+            "task-comment-detail", args=[task_for_user.id, comment_for_task.id]
+        )
+        etag = auth_client_manager_team.get(url)["ETag"]
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        task_for_user.status = StatusTask.PROGRESS
+        task_for_user.save()
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["task"]["status"] == StatusTask.PROGRESS
+        etag = response["ETag"]
+        task_for_user.team.title = "Новое название"
+        task_for_user.team.save()
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["task"]["team"]["title"] == "Новое название"
 
     def test_create_comment(
         self,
@@ -538,6 +1719,21 @@ class TestCommentNegative:
         response = auth_client_admin_another.get(url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @pytest.mark.parametrize('cursor', ['не-курсор', 'WyJ4Il0=', 'eyJhIjoxfQ=='])
+    def test_get_comment_invalid_cursor(
+        self,
+        auth_client_manager_team,
+        task_for_user,
+        comment_for_task,
+        cursor
+    ):
+        url = reverse(
+            "task-comments",
+            args=[task_for_user.id]
+        )
+        response = auth_client_manager_team.get(url, {"cursor": cursor})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     @pytest.mark.parametrize(
         'task_fixture,text,expected_status',
         [
@@ -591,10 +1787,296 @@ class TestMeetingPositive:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["team"]["id"] == team_with_participants.id
 
+    def test_create_meeting_right_after_another(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        meeting_for_team,
+        user_team
+    ):
+        """Встреча может начинаться сразу после окончания другой."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        data = {
+            "date": meeting_for_team.get_end_datetime().date(),
+            "time": meeting_for_team.get_end_datetime().time(),
+            "duration": 30,
+            "participants": [user_team.id],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_create_meeting_queries_do_not_depend_on_participants(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        django_user_model,
+    ):
+        """Тест на постоянное число запросов при создании встречи."""
+        users = django_user_model.objects.bulk_create(
+            django_user_model(
+                email=f'participant{number}@mail.ru',
+                username=f'participant{number}',
+            )
+            for number in range(12)
+        )
+        Membership.objects.bulk_create(
+            Membership(team=team_with_participants, user=user)
+            for user in users
+        )
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+
+        def count_queries(participants, days):
+            data = {
+                "date": (datetime.now() + timedelta(days=days)).date(),
+                "time": "10:00",
+                "duration": 60,
+                "participants": [user.id for user in participants],
+            }
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client_manager_team.post(
+                    url, data, format="json"
+                )
+            assert response.status_code == status.HTTP_201_CREATED
+            return len(context.captured_queries)
+
+        assert count_queries(users[:2], 1) == count_queries(users, 2)
+
+    def test_meeting_list_membership_queries_are_fixed(
+        self,
+        auth_client_user_team,
+        meeting_for_team,
+        admin_team,
+        manager_team,
+        user_team,
+    ):
+        """Тест на постоянное число запросов к составу команды."""
+        url = reverse("meetings-list")
+
+        def count_membership_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client_user_team.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            return len([
+                query for query in context.captured_queries
+                if 'teamflow_membership' in query['sql']
+            ])
+
+        single = count_membership_queries()
+        for days in range(2, 7):
+            meeting = Meeting.objects.create(
+                team=meeting_for_team.team,
+                author=admin_team,
+                date=(datetime.now() + timedelta(days=days)).date(),
+                time=meeting_for_team.time,
+                duration=30,
+            )
+            meeting.participants.set([manager_team, user_team])
+        assert count_membership_queries() == single
+
+    def test_meetings_calendar_feed(
+        self,
+        auth_client_user_team,
+        meeting_for_team,
+        meeting_for_another_team,
+    ):
+        """Тест на ленту встреч iCalendar с условным GET."""
+        response = auth_client_user_team.get(reverse("meetings-calendar-link"))
+        assert response.status_code == status.HTTP_200_OK
+        url = response.data["url"]
+        client = APIClient()
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/calendar")
+        body = b"".join(response.streaming_content).decode()
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert f"UID:meeting-{meeting_for_team.id}@teamflow" in body
+        assert f"meeting-{meeting_for_another_team.id}@" not in body
+        etag = response["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        meeting_for_team.duration += 15
+        meeting_for_team.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        day = meeting_for_team.date + timedelta(days=2)
+        response = client.get(
+            f"{url}&start={day.isoformat()}"
+            f"&end={(day + timedelta(days=7)).isoformat()}"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        body = b"".join(response.streaming_content).decode()
+        assert "BEGIN:VEVENT" not in body
+
+    def test_create_recurring_meeting_lists_occurrences(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        user_team
+    ):
+        """Тест на серию встреч и ее повторения в окне дат."""
+        today = datetime.now().date()
+        monday = today + timedelta(days=7 - today.weekday())
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        data = {
+            "date": monday,
+            "time": "09:00",
+            "duration": 30,
+            "rrule": "freq=weekly;byday=we,mo;count=6",
+            "participants": [user_team.id],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["rrule"] == "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=6"
+        meeting = Meeting.objects.get(id=response.data["id"])
+        assert meeting.series_end_at.date() == monday + timedelta(days=16)
+        response = auth_client_manager_team.get(reverse("meetings-list"))
+        assert len(response.data) == constants.ONE_OBJECT
+        response = auth_client_manager_team.get(
+            reverse("meetings-list")
+            + f"?start={monday + timedelta(days=1)}"
+            f"&end={monday + timedelta(days=14)}"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["date"] for item in response.data] == [
+            (monday + timedelta(days=days)).isoformat()
+            for days in (2, 7, 9)
+        ]
+        assert {item["id"] for item in response.data} == {meeting.id}
+
+    def test_recurring_meeting_conflict_queries_are_fixed(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        meeting_for_team,
+        user_team
+    ):
+        """Проверка пересечений серии не зависит от числа повторений."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+
+        def count_queries(days, rrule):
+            data = {
+                "date": meeting_for_team.date + timedelta(days=days),
+                "time": meeting_for_team.time,
+                "duration": 30,
+                "rrule": rrule,
+                "participants": [user_team.id],
+            }
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client_manager_team.post(
+                    url, data, format="json"
+                )
+            assert response.status_code == status.HTTP_201_CREATED
+            return len(context.captured_queries)
+
+        assert count_queries(1, "FREQ=WEEKLY;COUNT=2") == count_queries(
+            3, "FREQ=WEEKLY;INTERVAL=2;COUNT=60"
+        )
+
+    def test_recurring_meeting_in_dashboard_and_calendar(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        admin_team,
+        user_team
+    ):
+        """Тест на ближайшие повторения серии и RRULE в ленте."""
+        today = timezone.localdate()
+        meeting = Meeting.objects.create(
+            team=team_with_participants,
+            author=admin_team,
+            date=today - timedelta(days=10),
+            time=datetime.min.time(),
+            duration=15,
+            rrule="FREQ=DAILY;UNTIL=" + f"{today + timedelta(days=20):%Y%m%d}",
+        )
+        meeting.participants.set([user_team])
+        response = auth_client_user_team.get(reverse("users-me-dashboard"))
+        assert response.status_code == status.HTTP_200_OK
+        dates = [
+            datetime.fromisoformat(item["date"]).date()
+            for item in response.data["upcoming_meetings"]
+        ]
+        assert dates[0] in (today, today + timedelta(days=1))
+        assert dates == [
+            dates[0] + timedelta(days=days) for days in range(5)
+        ]
+        response = auth_client_user_team.get(reverse("meetings-calendar-link"))
+        response = APIClient().get(response.data["url"])
+        body = b"".join(response.streaming_content).decode()
+        until = today + timedelta(days=20)
+        assert f"RRULE:FREQ=DAILY;UNTIL={until:%Y%m%d}T000000Z" in body
+
+    def test_meeting_list_cache_follows_participants(
+        self,
+        auth_client_user_team,
+        team_with_participants,
+        meeting_for_team,
+        user_team
+    ):
+        """Смена участников встречи сбрасывает кеш списка команды."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        response = auth_client_user_team.get(url)
+        assert len(response.data) == constants.ONE_OBJECT
+        meeting_for_team.participants.remove(user_team)
+        response = auth_client_user_team.get(url)
+        assert response.data == []
+
+    def test_meeting_detail_etag_follows_participants(
+        self,
+        auth_client_manager_team,
+        meeting_for_team,
+        user_team
+    ):
+        """Смена участников встречи меняет ее ETag."""
+        url = reverse("meetings-detail", args=[meeting_for_team.id])
+        etag = auth_client_manager_team.get(url)["ETag"]
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        meeting_for_team.participants.remove(user_team)
+        response = auth_client_manager_team.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert user_team.id not in response.data["participants"]
+
 
 class TestMeetingNegative:
     """Набор негативных тестов для встреч."""
 
+    def test_meetings_calendar_feed_invalid_token(self, api_client):
+        """Тест на ленту встреч с подделанным токеном."""
+        response = api_client.get(
+            reverse("meetings-calendar"), {"token": "1:forged"}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_meetings_calendar_feed_revoked(
+        self,
+        auth_client_user_team,
+        user_team,
+        meeting_for_team,
+    ):
+        """Тест на отзыв ссылки на ленту и блокировку пользователя."""
+        link = reverse("meetings-calendar-link")
+        old_url = auth_client_user_team.get(link).data["url"]
+        response = auth_client_user_team.post(link)
+        assert response.status_code == status.HTTP_200_OK
+        url = response.data["url"]
+        assert url != old_url
+        client = APIClient()
+        assert client.get(old_url).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        body = b"".join(response.streaming_content).decode()
+        fields = dict(
+            line.split(":", 1) for line in body.split("\r\n") if ":" in line
+        )
+        stamp = datetime.strptime(fields["DTSTAMP"], "%Y%m%dT%H%M%SZ")
+        assert fields["DTSTAMP"] != fields["DTSTART"]
+        assert abs(stamp - datetime.utcnow()) < timedelta(minutes=1)
+        user_team.is_active = False
+        user_team.save()
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
     def test_get_meeting_another_team(
         self,
         auth_client_user_team,
@@ -621,6 +2103,135 @@ class TestMeetingNegative:
         response = auth_client_manager_team.post(url, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_create_overlapping_meeting(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        meeting_for_team,
+        manager_team,
+        user_team
+    ):
+        """Тест на создание встречи, пересекающейся с другой."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        start = meeting_for_team.get_start_datetime() + timedelta(minutes=30)
+        data = {
+            "date": start.date(),
+            "time": start.time(),
+            "duration": 60,
+            "participants": [user_team.id],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert sorted(
+            conflict["participant"] for conflict in response.data["conflicts"]
+        ) == sorted([manager_team.username, user_team.username])
+        assert Meeting.objects.count() == constants.ONE_OBJECT
+
+    def test_create_recurring_meeting_overlapping(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        meeting_for_team,
+        user_team
+    ):
+        """Тест на серию, повторение которой пересекается со встречей."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        data = {
+            "date": meeting_for_team.date - timedelta(days=1),
+            "time": meeting_for_team.time,
+            "duration": 30,
+            "rrule": "FREQ=DAILY;COUNT=3",
+            "participants": [user_team.id],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["conflict_date"] == [
+            meeting_for_team.date.isoformat()
+        ]
+        assert Meeting.objects.count() == constants.ONE_OBJECT
+
+    @pytest.mark.parametrize(
+        "rrule",
+        [
+            "FREQ=MONTHLY;COUNT=3",
+            "FREQ=DAILY",
+            "FREQ=DAILY;COUNT=2;UNTIL=20300101",
+            "FREQ=DAILY;COUNT=400",
+            "FREQ=DAILY;INTERVAL=0;COUNT=2",
+            "FREQ=DAILY;BYDAY=MO;COUNT=2",
+            "FREQ=WEEKLY;BYDAY=XX;COUNT=2",
+            "FREQ=WEEKLY;UNTIL=2000-01-01",
+        ]
+    )
+    def test_create_meeting_invalid_rrule(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        user_team,
+        rrule
+    ):
+        """Тест на создание серии с неверным правилом повторения."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        data = {
+            "date": (datetime.now() + timedelta(days=1)).date(),
+            "time": "10:00",
+            "duration": 30,
+            "rrule": rrule,
+            "participants": [user_team.id],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "rrule" in response.data
+        assert not Meeting.objects.exists()
+
+    def test_create_weekly_meeting_outside_byday(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        user_team
+    ):
+        """Дата первой встречи серии должна совпадать с одним из BYDAY."""
+        today = datetime.now().date()
+        tuesday = today + timedelta(days=(1 - today.weekday()) % 7 or 7)
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        data = {
+            "date": tuesday,
+            "time": "10:00",
+            "duration": 30,
+            "rrule": "FREQ=WEEKLY;BYDAY=MO,FR;COUNT=4",
+            "participants": [user_team.id],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "rrule" in response.data
+
+    def test_create_meeting_reports_all_foreign_participants(
+        self,
+        auth_client_manager_team,
+        team_with_participants,
+        admin_another_team,
+        user_another_team,
+        user_team
+    ):
+        """Все участники не из команды перечисляются в одной ошибке."""
+        url = reverse("meetings-list") + f"?team={team_with_participants.id}"
+        data = {
+            "date": (datetime.now() + timedelta(days=1)).date(),
+            "time": (datetime.now() + timedelta(hours=1)).time(),
+            "duration": 30,
+            "participants": [
+                user_team.id,
+                admin_another_team.id,
+                user_another_team.id,
+                0,
+            ],
+        }
+        response = auth_client_manager_team.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert sorted(map(int, response.data["participants"])) == sorted([
+            0, admin_another_team.id, user_another_team.id
+        ])
+
     def test_create_meeting_in_foreign_team(
         self,
         auth_client_manager_team,
@@ -640,3 +2251,110 @@ class TestMeetingNegative:
 
         response = auth_client_manager_team.post(url, data, format="json")
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestQueryPlans:
+    """Планы запросов основных эндпоинтов без последовательного сканирования."""
+
+    @pytest.fixture
+    def seeded_data(
+        self,
+        team_with_participants,
+        completed_task_user,
+        comment_for_task,
+        meeting_for_team,
+        manager_team,
+        user_team,
+    ):
+        Task.objects.bulk_create(
+            Task(
+                author=manager_team,
+                title=f'Задача {number}',
+                description='Описание задачи',
+                deadline=(datetime.now() + timedelta(days=number)).date(),
+                executor=user_team,
+                team=team_with_participants,
+                status=StatusTask.OPEN,
+            )
+            for number in range(50)
+        )
+        Evaluation.objects.create(
+            task=completed_task_user,
+            evaluator=manager_team,
+            rating=5
+        )
+        return {
+            'team': team_with_participants.id,
+            'task': completed_task_user.id,
+            'date': meeting_for_team.date.isoformat(),
+            'week_end': (
+                meeting_for_team.date + timedelta(days=7)
+            ).isoformat(),
+            'executor': user_team.id,
+        }
+
+    @pytest.mark.parametrize(
+        'url_name,url_args,params',
+        [
+            ('tasks-list', [], {'team': 'team'}),
+            ('tasks-list', [], {'team': 'team', 'status': StatusTask.OPEN}),
+            ('tasks-list', [], {'team': 'team', 'ordering': 'deadline'}),
+            ('tasks-list', [], {'team': 'team', 'q': 'Задача'}),
+            ('tasks-detail', ['task'], {}),
+            ('task-comments', ['task'], {}),
+            ('meetings-list', [], {'team': 'team', 'date': 'date'}),
+            ('meetings-list', [], {'start': 'date', 'end': 'week_end'}),
+            ('teams-list', [], {}),
+            ('teams-members', ['team'], {}),
+            ('teams-stats', ['team'], {}),
+            ('teams-my-roles', [], {}),
+            ('users-me-dashboard', [], {}),
+            ('users-executor-evaluations', [], {}),
+            ('users-search', [], {'q': 'userteam', 'team': 'team'}),
+        ]
+    )
+    def test_endpoint_queries_use_indexes(
+        self,
+        auth_client_user_team,
+        seeded_data,
+        url_name,
+        url_args,
+        params,
+    ):
+        """Тест на отсутствие последовательного сканирования таблиц."""
+        url = reverse(url_name, args=[seeded_data[arg] for arg in url_args])
+        params = {
+            key: seeded_data.get(value, value)
+            for key, value in params.items()
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client_user_team.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        assert selects
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            for sql in selects:
+                cursor.execute(f'EXPLAIN {sql}')
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+                assert 'Seq Scan' not in plan, f'{sql}\n{plan}'
+            cursor.execute('RESET enable_seqscan')
+
+    def test_registration_email_lookup_uses_index(
+        self,
+        django_user_model,
+        user_team
+    ):
+        """Тест на поиск почты без учета регистра по индексу."""
+        queryset = django_user_model.objects.filter(
+            email__iexact=user_team.email.upper()
+        ).order_by()
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            plan = queryset.explain()
+            cursor.execute('RESET enable_seqscan')
+        assert 'Seq Scan' not in plan
+        assert 'Index Cond: (upper((email)::text)' in plan
@@ -0,0 +1,31 @@
+import uuid
+
+from django.db import migrations, models
+
+
+def fill_calendar_keys(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    for user in User.objects.only('pk').iterator():
+        user.calendar_key = uuid.uuid4()
+        user.save(update_fields=['calendar_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_email_upper_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='calendar_key',
+            field=models.UUIDField(null=True, editable=False),
+        ),
+        migrations.RunPython(fill_calendar_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='calendar_key',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, verbose_name='Ключ ленты календаря'),
+        ),
+    ]
@@ -1,6 +1,10 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import validate_email
 from django.db import models
+from django.db.models.functions import Upper
 
 import users.constants as constants
 
@@ -44,11 +48,35 @@ class User(AbstractUser):
         blank=True,
         verbose_name='Биография'
     )
+    calendar_key = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name='Ключ ленты календаря'
+    )
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+            GinIndex(
+                OpClass(Upper('username'), name='gin_trgm_ops'),
+                name='user_username_trgm_idx'
+            ),
+            GinIndex(
+                OpClass(Upper('email'), name='gin_trgm_ops'),
+                name='user_email_trgm_idx'
+            ),
+            GinIndex(
+                OpClass(Upper('first_name'), name='gin_trgm_ops'),
+                name='user_first_name_trgm_idx'
+            ),
+            GinIndex(
+                OpClass(Upper('last_name'), name='gin_trgm_ops'),
+                name='user_last_name_trgm_idx'
+            ),
+        ]
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
 
@@ -6,6 +6,7 @@ export default function DashboardPage() {
   const { user: currentUser, token, logout } = useAuth();
   const [userData, setUserData] = useState(null);
   const [evaluationsData, setEvaluationsData] = useState(null);
+  const [evaluationsSummary, setEvaluationsSummary] = useState(null);
   const [isEditing, setIsEditing] = useState(false);
   const [formData, setFormData] = useState({
     email: "",
@@ -19,6 +20,7 @@ export default function DashboardPage() {
   const [showDeleteConfirm, setShowDeleteConfirm] = useState(false);
   const [activeTab, setActiveTab] = useState("profile");
   const [loadingEvaluations, setLoadingEvaluations] = useState(false);
+  const [loadingMoreEvaluations, setLoadingMoreEvaluations] = useState(false);
 
   useEffect(() => {
     if (currentUser) {
@@ -28,16 +30,18 @@ export default function DashboardPage() {
 
   const fetchUserData = async () => {
     try {
-      const response = await axios.get("/api/users/me/", {
+      const response = await axios.get("/api/users/me/dashboard/", {
         headers: { Authorization: `Token ${token}` },
       });
-      setUserData(response.data);
+      const profile = response.data.profile;
+      setUserData(profile);
+      setEvaluationsSummary(response.data.evaluations);
       setFormData({
-        email: response.data.email,
-        username: response.data.username,
-        first_name: response.data.first_name || "",
-        last_name: response.data.last_name || "",
-        bio: response.data.bio || ""
+        email: profile.email,
+        username: profile.username,
+        first_name: profile.first_name || "",
+        last_name: profile.last_name || "",
+        bio: profile.bio || ""
       });
     } catch (err) {
       console.error("Ошибка загрузки данных пользователя", err);
@@ -62,6 +66,26 @@ export default function DashboardPage() {
     }
   };
 
+  const fetchMoreEvaluations = async () => {
+    if (!evaluationsData?.next) return;
+    setLoadingMoreEvaluations(true);
+    try {
+      const response = await axios.get(evaluationsData.next, {
+        headers: { Authorization: `Token ${token}` },
+      });
+      setEvaluationsData(prev => ({
+        ...response.data,
+        evaluations: [...prev.evaluations, ...response.data.evaluations],
+      }));
+      setError(null);
+    } catch (err) {
+      console.error("Ошибка загрузки оценок", err);
+      setError("Не удалось загрузить оценки");
+    } finally {
+      setLoadingMoreEvaluations(false);
+    }
+  };
+
   const handleInputChange = (e) => {
     const { name, value } = e.target;
     setFormData(prev => ({ ...prev, [name]: value }));
@@ -146,7 +170,8 @@ export default function DashboardPage() {
           style={activeTab === "evaluations" ? styles.activeTab : styles.tab}
           onClick={() => handleTabChange("evaluations")}
         >
-          Мои оценки {evaluationsData && `(${evaluationsData.total_evaluations})`}
+          Мои оценки {(evaluationsData || evaluationsSummary) &&
+            `(${(evaluationsData || evaluationsSummary).total_evaluations})`}
         </button>
       </div>
 
@@ -176,6 +201,8 @@ export default function DashboardPage() {
           evaluationsData={evaluationsData}
           loading={loadingEvaluations}
           onRefresh={fetchEvaluationsData}
+          loadingMore={loadingMoreEvaluations}
+          onLoadMore={fetchMoreEvaluations}
         />
       )}
     </div>
@@ -354,7 +381,13 @@ const ProfileTab = ({
 };
 
 // Компонент вкладки оценок
-const EvaluationsTab = ({ evaluationsData, loading, onRefresh }) => {
+const EvaluationsTab = ({
+  evaluationsData,
+  loading,
+  onRefresh,
+  loadingMore,
+  onLoadMore,
+}) => {
   if (loading) {
     return <p style={styles.loading}>Загрузка оценок...</p>;
   }
@@ -420,6 +453,16 @@ const EvaluationsTab = ({ evaluationsData, loading, onRefresh }) => {
               </div>
             </div>
           ))}
+          {evaluationsData.next && (
+            <button
+              type="button"
+              onClick={onLoadMore}
+              style={styles.refreshButton}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Загрузка..." : "Показать еще"}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -104,7 +104,11 @@ const MeetingForm = () => {
       const errorData = err.response?.data;
       
       if (errorData) {
-        const errorMessages = Object.values(errorData).flat().join(', ');
+        const errorMessages = Object.entries(errorData)
+          .filter(([key]) => key !== 'conflicts')
+          .map(([, value]) => value)
+          .flat()
+          .join(', ');
         setError(errorMessages);
       } else {
         setError("Не удалось сохранить встречу");
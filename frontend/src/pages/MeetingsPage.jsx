@@ -29,6 +29,22 @@ const MeetingPage = () => {
       .catch(err => console.error(err));
   }, [teamId, token]);
 
+  const fetchAllTasks = async (params) => {
+    const allTasks = [];
+    let res = await axios.get("/api/tasks/", {
+      params: { ...params, page_size: 100 },
+      headers: { Authorization: `Token ${token}` },
+    });
+    allTasks.push(...res.data.results);
+    while (res.data.next) {
+      res = await axios.get(res.data.next, {
+        headers: { Authorization: `Token ${token}` },
+      });
+      allTasks.push(...res.data.results);
+    }
+    return allTasks;
+  };
+
   const fetchData = async () => {
     try {
       const params = {};
@@ -36,18 +52,15 @@ const MeetingPage = () => {
         params.team = teamId;
       }
 
-      const [meetingsRes, tasksRes] = await Promise.all([
+      const [meetingsRes, allTasks] = await Promise.all([
         axios.get("/api/meetings/", {
           params,
           headers: { Authorization: `Token ${token}` },
         }),
-        axios.get(`/api/tasks/`, {
-          params: { ...params},
-          headers: { Authorization: `Token ${token}` },
-        })
+        fetchAllTasks(params)
       ]);
       setMeetings(meetingsRes.data);
-      setTasks(tasksRes.data);
+      setTasks(allTasks);
     } catch (err) {
       console.error("Ошибка загрузки данных", err);
       setError("Не удалось загрузить данные");
@@ -30,6 +30,8 @@ const TaskDetail = () => {
   const [comments, setComments] = useState([]);
   const [newComment, setNewComment] = useState("");
   const [loadingComments, setLoadingComments] = useState(true);
+  const [commentsNext, setCommentsNext] = useState(null);
+  const [loadingOlderComments, setLoadingOlderComments] = useState(false);
   const [sendingComment, setSendingComment] = useState(false);
 
   useEffect(() => {
@@ -64,7 +66,8 @@ const TaskDetail = () => {
         const response = await axios.get(`/api/tasks/${id}/comments/`, {
           headers: { Authorization: `Token ${token}` },
         });
-        setComments(response.data);
+        setComments(response.data.results);
+        setCommentsNext(response.data.next);
       } catch (err) {
         console.error("Ошибка загрузки комментариев", err);
       } finally {
@@ -77,6 +80,23 @@ const TaskDetail = () => {
   }, [id, token]);
 
 
+  const handleLoadOlderComments = async () => {
+    if (!commentsNext || loadingOlderComments) return;
+
+    setLoadingOlderComments(true);
+    try {
+      const response = await axios.get(commentsNext, {
+        headers: { Authorization: `Token ${token}` },
+      });
+      setComments(prev => [...prev, ...response.data.results]);
+      setCommentsNext(response.data.next);
+    } catch (err) {
+      console.error("Ошибка загрузки комментариев", err);
+    } finally {
+      setLoadingOlderComments(false);
+    }
+  };
+
   const handleStatusChange = async (newStatus) => {
     if (!task || task.status === newStatus) return;
 
@@ -269,6 +289,16 @@ const TaskDetail = () => {
                     </div>
                   </div>
                 ))}
+                {commentsNext && (
+                  <button
+                    type="button"
+                    style={styles.loadOlderButton}
+                    onClick={handleLoadOlderComments}
+                    disabled={loadingOlderComments}
+                  >
+                    {loadingOlderComments ? "Загрузка..." : "Показать более ранние"}
+                  </button>
+                )}
               </div>
             )}
           </div>
@@ -558,6 +588,16 @@ const styles = {
       borderColor: "#3b82f6",
     },
   },
+  loadOlderButton: {
+    alignSelf: "center",
+    padding: "8px 16px",
+    backgroundColor: "transparent",
+    color: "#4f46e5",
+    border: "1px solid #4f46e5",
+    borderRadius: "6px",
+    cursor: "pointer",
+    fontSize: "14px",
+  },
   sendButton: {
     display: "flex",
     alignItems: "center",
@@ -37,6 +37,7 @@ const TaskForm = () => {
         if (teamId) {
           const usersRes = await axios.get(`/api/teams/${teamId}/`, {
             headers: { Authorization: `Token ${token}` },
+            params: { expand: "participants" },
           });
           setUsers(usersRes.data.participants || []);
         }
@@ -56,6 +57,7 @@ const TaskForm = () => {
           if (task.team?.id) {
             const teamUsersRes = await axios.get(`/api/teams/${task.team.id}/`, {
               headers: { Authorization: `Token ${token}` },
+              params: { expand: "participants" },
             });
             setUsers(teamUsersRes.data.participants || []);
           }
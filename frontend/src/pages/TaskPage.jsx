@@ -17,6 +17,7 @@ const TaskPage = () => {
   const [showErrorModal, setShowErrorModal] = useState(false);
   const [errorMessage, setErrorMessage] = useState('');
   const [hasMore, setHasMore] = useState(true);
+  const [stats, setStats] = useState(null);
   
   const observer = useRef();
   const lastTaskElementRef = useCallback(node => {
@@ -41,7 +42,7 @@ const TaskPage = () => {
 
   const teamId = new URLSearchParams(location.search).get("team");
   const limit = 20;
-  const offsetRef = useRef(0);
+  const nextRef = useRef(null);
 
   const fetchTasks = async (loadMore = false) => {
     try {
@@ -49,33 +50,35 @@ const TaskPage = () => {
         setLoadingMore(true);
       } else {
         setLoading(true);
-        offsetRef.current = 0;
+        nextRef.current = null;
         setTasks([]);
         setHasMore(true);
       }
 
       const params = new URLSearchParams({
         team: teamId,
-        limit: limit,
-        offset: offsetRef.current
+        page_size: limit
       });
 
       Object.entries(filters).forEach(([key, value]) => {
         if (value) params.append(key, value);
       });
 
-      const res = await axios.get(`/api/tasks/?${params}`, {
+      const url = loadMore && nextRef.current
+        ? nextRef.current
+        : `/api/tasks/?${params}`;
+      const res = await axios.get(url, {
         headers: { Authorization: `Token ${token}` },
       });
 
       if (loadMore) {
-        setTasks(prevTasks => [...prevTasks, ...res.data]);
+        setTasks(prevTasks => [...prevTasks, ...res.data.results]);
       } else {
-        setTasks(res.data);
+        setTasks(res.data.results);
       }
 
-      offsetRef.current += res.data.length;
-      setHasMore(res.data.length === limit);
+      nextRef.current = res.data.next;
+      setHasMore(Boolean(res.data.next));
     } catch (err) {
       console.error("Ошибка загрузки задач", err);
       handleError("Не удалось загрузить задачи");
@@ -84,6 +87,12 @@ const TaskPage = () => {
       setLoadingMore(false);
     }
   };
+  const fetchStats = () => {
+    axios.get(`/api/teams/${teamId}/stats/`, {
+      headers: { Authorization: `Token ${token}` }
+    }).then(res => setStats(res.data))
+      .catch(err => console.error(err));
+  };
   const rateTask = async (taskId, rating) => {
     try {
       const taskToRate = tasks.find(task => task.id === taskId);
@@ -132,6 +141,7 @@ const TaskPage = () => {
       headers: { Authorization: `Token ${token}` }
     }).then(res => setMyRole(res.data.role))
       .catch(err => console.error(err));
+    fetchStats();
   }, [teamId, token]);
 
   useEffect(() => {
@@ -169,6 +179,7 @@ const TaskPage = () => {
           task.id === draggedTask.id ? { ...task, status: newStatus } : task
         )
       );
+      fetchStats();
     } catch (err) {
       console.error("Ошибка изменения статуса", err);
       handleError("Не удалось изменить статус задачи");
@@ -249,6 +260,12 @@ const TaskPage = () => {
   const filteredTasks = (status) => {
     return tasks.filter(task => task.status === status);
   };
+  const columnCount = (status) => {
+    if (!stats || Object.values(filters).some(Boolean)) {
+      return filteredTasks(status).length;
+    }
+    return stats[status];
+  };
 
   const resetFilters = () => {
     setFilters({
@@ -341,7 +358,7 @@ const TaskPage = () => {
                 {status === 'progress' && 'В работе'}
                 {status === 'completed' && 'Завершенные'}
               </h3>
-              <span style={styles.taskCount}>{filteredTasks(status).length}</span>
+              <span style={styles.taskCount}>{columnCount(status)}</span>
             </div>
 
             <div style={styles.taskList}>
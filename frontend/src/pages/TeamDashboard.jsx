@@ -11,6 +11,7 @@ const TeamDashboard = () => {
   const [users, setUsers] = useState([]);
   const [newTeamTitle, setNewTeamTitle] = useState("");
   const [selectedUsers, setSelectedUsers] = useState({});
+  const [userQueries, setUserQueries] = useState({});
   const [selectedRoles, setSelectedRoles] = useState({});
   const [editingRoles, setEditingRoles] = useState({});
   const [roleValues, setRoleValues] = useState({});
@@ -20,7 +21,6 @@ const TeamDashboard = () => {
   useEffect(() => {
     if (token) {
       fetchTeams();
-      fetchUsers();
     } else {
       navigate("/login");
     }
@@ -30,6 +30,7 @@ const TeamDashboard = () => {
     try {
       const res = await axios.get("/api/teams/", {
         headers: { Authorization: `Token ${token}` },
+        params: { expand: "participants" },
       });
       setTeams(res.data.results || res.data);
     } catch (err) {
@@ -38,14 +39,20 @@ const TeamDashboard = () => {
     }
   };
 
-  const fetchUsers = async () => {
+  const searchUsers = async (teamId, query) => {
+    setUserQueries((prev) => ({ ...prev, [teamId]: query }));
+    if (query.trim().length < 3) {
+      setUsers([]);
+      return;
+    }
     try {
-      const res = await axios.get("/api/users/", {
+      const res = await axios.get("/api/users/search/", {
         headers: { Authorization: `Token ${token}` },
+        params: { q: query.trim() },
       });
       setUsers(res.data);
     } catch (err) {
-      console.error("Ошибка загрузки пользователей", err.response?.data || err.message);
+      console.error("Ошибка поиска пользователей", err.response?.data || err.message);
     }
   };
 
@@ -232,6 +239,13 @@ const TeamDashboard = () => {
                 
                 {canAddParticipants(team) && (
                   <div style={styles.addParticipantContainer}>
+                    <input
+                      type="text"
+                      placeholder="Поиск пользователя"
+                      value={userQueries[team.id] || ""}
+                      onChange={(e) => searchUsers(team.id, e.target.value)}
+                      style={styles.select}
+                    />
                     <select
                       value={selectedUsers[team.id] || ""}
                       onChange={(e) => {